@@ -0,0 +1,195 @@
+"""guild_id / user_idのインデックスの有無で, 戦績とフレンド申請のクエリの実行計画と実行時間を比較する.
+
+ローカルのMySQLに大量の行を作成するため, 本番のデータベースには使わないこと.
+指定したデータベースのresultsテーブルとrequestsテーブルは削除して作り直される.
+
+Examples
+--------
+.. code-block:: console
+
+    $ docker run --rm -d -p 3306:3306 -e MYSQL_ALLOW_EMPTY_PASSWORD=yes -e MYSQL_DATABASE=bench mysql:8
+    $ task bench-db-indexes --dsn mysql+aiomysql://root@127.0.0.1:3306/bench
+    $ python -m benchmarks.db_indexes --dsn mysql+aiomysql://root@127.0.0.1:3306/bench --results 5000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Iterator
+
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from model.requests import requests
+from model.results import results
+from repository.repository import select_results_page
+from utils.utils import chunked
+
+if TYPE_CHECKING:
+    from sqlalchemy import Delete, Select
+
+    # EXPLAINするためにコンパイルでき, 実行もできるクエリ.
+    Query = Select | Delete
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# 1回のINSERT文で作成する行の数.
+SEED_BATCH_SIZE = 10_000
+
+
+def seed_results(n: int, guilds: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, 21)
+
+    for _ in range(n):
+        score = rng.randint(350, 634)
+        yield {
+            "guild_id": rng.randrange(guilds) + 10**17,
+            "played_at": start + timedelta(minutes=rng.randrange(5 * 365 * 24 * 60)),
+            "score": score,
+            "enemy": f"Team{rng.randrange(500)}",
+            "enemy_score": 984 - score,
+        }
+
+
+def seed_requests(n: int, users: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    rng = random.Random(seed)
+
+    for i in range(n):
+        yield {
+            "user_id": rng.randrange(users) + 10**17,
+            "target_user_name": f"Player{i}",
+            "target_user_switch_fc": f"{rng.randrange(10**12):012d}",
+            "target_user_nsa_id": f"{rng.getrandbits(64):016x}",
+        }
+
+
+async def seed(engine: AsyncEngine, args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: results.drop(c, checkfirst=True))
+        await conn.run_sync(lambda c: requests.drop(c, checkfirst=True))
+        await conn.run_sync(lambda c: results.create(c))
+        await conn.run_sync(lambda c: requests.create(c))
+
+    for table, rows, total in (
+        (results, seed_results(args.results, args.guilds), args.results),
+        (requests, seed_requests(args.requests, args.users), args.requests),
+    ):
+        started_at = time.perf_counter()
+
+        for i, batch in enumerate(chunked(rows, SEED_BATCH_SIZE)):
+            async with engine.begin() as conn:
+                await conn.execute(table.insert(), batch)
+
+            print(f"\rseeding {table.name}: {min((i + 1) * SEED_BATCH_SIZE, total):,}/{total:,}", end="", flush=True)
+
+        print(f" ({time.perf_counter() - started_at:.1f}s)")
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"ANALYZE TABLE {results.name}, {requests.name}"))
+
+
+async def set_indexes(engine: AsyncEngine, enabled: bool) -> None:
+    async with engine.begin() as conn:
+        for table in (results, requests):
+            for index in table.indexes:
+                if enabled:
+                    await conn.run_sync(lambda c: index.create(c, checkfirst=True))
+                else:
+                    await conn.run_sync(lambda c: index.drop(c, checkfirst=True))
+
+
+def get_queries(guild_id: int, user_id: int) -> dict[str, Query]:
+    """Repositoryが実行するクエリのうち, インデックスの影響を受けるもの.
+    results_pageはページの途中の位置から続きを取得するクエリで, 実行計画にUsing filesortが無いことを確認する.
+    """
+    return {
+        "get_results": select(
+            results.c.id,
+            results.c.played_at,
+            results.c.score,
+            results.c.enemy,
+            results.c.enemy_score,
+        )
+        .where(results.c.guild_id == guild_id)
+        .order_by(desc(results.c.played_at)),
+        "results_page": select_results_page(guild_id, 25, before=(datetime(2022, 7, 1, 21), 10**9)),
+        "count_results": select(func.count()).select_from(results).where(results.c.guild_id == guild_id),
+        "get_requests": select(
+            requests.c.target_user_switch_fc,
+            requests.c.target_user_name,
+            requests.c.target_user_nsa_id,
+        ).where(requests.c.user_id == user_id),
+        "delete_requests": requests.delete().where(requests.c.user_id == user_id),
+    }
+
+
+async def explain(conn: AsyncConnection, query: Query) -> str:
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.execute(text(f"EXPLAIN {compiled}"))
+    row = result.mappings().one()
+    return f"type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}"
+
+
+async def measure(engine: AsyncEngine, query: Query, repeat: int) -> float:
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        async with engine.connect() as conn:
+            started_at = time.perf_counter()
+            await conn.execute(query)
+            timings.append(time.perf_counter() - started_at)
+            # 削除するクエリも計測のみで, 行は削除しない.
+            await conn.rollback()
+
+    return min(timings)
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.dsn)
+
+    try:
+        if not args.skip_seed:
+            await seed(engine, args)
+
+        queries = get_queries(guild_id=10**17 + args.guilds // 2, user_id=10**17 + args.users // 2)
+        timings: dict[str, dict[bool, float]] = {name: {} for name in queries}
+
+        for enabled in (False, True):
+            await set_indexes(engine, enabled)
+            print(f"\n[{'with' if enabled else 'without'} indexes]")
+
+            for name, query in queries.items():
+                async with engine.connect() as conn:
+                    plan = await explain(conn, query)
+
+                timings[name][enabled] = await measure(engine, query, args.repeat)
+                print(f"{name:>16}: {timings[name][enabled] * 1e3:>9.2f}ms  {plan}")
+
+        print(f"\n{'query':>16} {'without':>11} {'with':>11} {'speedup':>8}")
+
+        for name, t in timings.items():
+            print(f"{name:>16} {t[False] * 1e3:>9.2f}ms {t[True] * 1e3:>9.2f}ms {t[False] / t[True]:>7.1f}x")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="インデックスの有無によるクエリの実行計画と実行時間を比較する.")
+    parser.add_argument("--dsn", required=True, help="ベンチマーク用のMySQLのURL (mysql+aiomysql://...)")
+    parser.add_argument("--results", type=int, default=2_000_000, help="作成する戦績の数")
+    parser.add_argument("--guilds", type=int, default=5_000, help="戦績を持つサーバーの数")
+    parser.add_argument("--requests", type=int, default=1_000_000, help="作成するフレンド申請の数")
+    parser.add_argument("--users", type=int, default=50_000, help="フレンド申請を持つユーザーの数")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="前回作成した行をそのまま使う")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""`/result list`の表の作成にかかる時間を, 以前のpandasによる実装と比較する.
+
+Examples
+--------
+.. code-block:: console
+
+    $ task bench-result-table
+    $ python -m benchmarks.result_table --rows 100 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from utils.format import win_or_lose
+from utils.result_table import create_result_table
+
+if TYPE_CHECKING:
+    from model.results import ResultItemWithID
+
+
+def create_results(n: int, seed: int = 0) -> list[ResultItemWithID]:
+    rng = random.Random(seed)
+    enemies = [f"Team{i}" for i in range(50)]
+    start = datetime(2022, 1, 1, 21)
+    results: list[ResultItemWithID] = []
+
+    for i in range(n):
+        score = rng.randint(350, 634)
+        results.append(
+            {
+                "id": n - i,
+                "date": start + timedelta(hours=n - i),
+                "score": score,
+                "enemy": rng.choice(enemies),
+                "enemyScore": 984 - score,
+            }
+        )
+
+    return results
+
+
+def pandas_table(results: list[ResultItemWithID], enemy: str | None) -> tuple[list[str], int, int, int]:
+    """以前のhandler.result.create_result_paginatorと同じ処理."""
+    import pandas as pd
+
+    df = pd.DataFrame(results).copy()
+
+    if enemy is not None:
+        df = df.query(f"enemy == '{enemy}'").copy()
+
+    df["fmt_score"] = df["score"].astype(str) + " - " + df["enemyScore"].astype(str)
+    df["diff"] = df["score"] - df["enemyScore"]
+    df["fmt_date"] = df["date"].dt.strftime("%Y/%m/%d")
+    columns = ["id", "fmt_date", "fmt_score", "diff"] if enemy is not None else ["id", "fmt_score", "enemy", "diff"]
+    lines = df.to_string(
+        columns=columns,
+        formatters={"diff": win_or_lose},
+        header=False,
+        justify="center",
+        index=False,
+    ).split("\n")
+    win, lose, draw = (
+        df[df["diff"] > 0].shape[0],
+        df[df["diff"] < 0].shape[0],
+        df[df["diff"] == 0].shape[0],
+    )
+    return lines, win, lose, draw
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="戦績の表の作成にかかる時間を計測する.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'filter':>7} {'pandas':>10} {'table':>10} {'speedup':>8}")
+
+    for n in args.rows:
+        results = create_results(n)
+
+        for enemy in (None, results[0]["enemy"]):
+            expected = pandas_table(results, enemy)
+            table = create_result_table(results, enemy)
+            assert (table.lines, table.win, table.lose, table.draw) == expected, "output differs from pandas"
+
+            number = max(1, 10_000 // n)
+            t_pandas = min(timeit.repeat(lambda: pandas_table(results, enemy), number=number, repeat=args.repeat)) / number
+            t_table = (
+                min(timeit.repeat(lambda: create_result_table(results, enemy), number=number, repeat=args.repeat)) / number
+            )
+
+            print(
+                f"{n:>8} {'enemy' if enemy else '-':>7} {t_pandas * 1e3:>8.2f}ms {t_table * 1e3:>8.2f}ms "
+                f"{t_pandas / t_table:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
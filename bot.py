@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from aiohttp import ClientSession
@@ -9,11 +11,21 @@ from dependency_injector.wiring import Provide, inject
 from discord import Activity, ActivityType, Intents, Status
 from discord.ext import commands
 
+from figure.cache import FigureCache
+from figure.renderer import FigureRenderer
 from handler import Handler
 from mk8dx import LoungeClient
 from repository import Config
+from repository.config import (
+    DEFAULT_MAX_OVERFLOW,
+    DEFAULT_POOL_RECYCLE,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_POOL_TIMEOUT,
+    DEFAULT_STATEMENT_TIMEOUT,
+)
 from service import Service
 from ui.bookmark import BookmarkView
+from utils.parser import parse_bool
 
 fmt = "%(asctime)s:%(levelname)s:%(name)s: %(message)s"
 logging.basicConfig(level=logging.INFO, format=fmt, handlers=[logging.StreamHandler()])
@@ -38,6 +50,7 @@ class Bot(commands.AutoShardedBot):
         h: IHandler
         _token: str
         persistent_views_added: bool
+        _warm_up_task: asyncio.Task | None
         session: ClientSession
 
     def __init__(
@@ -64,10 +77,13 @@ class Bot(commands.AutoShardedBot):
         self.h = h
         self._token = token
         self.persistent_views_added = False
+        self._warm_up_task = None
 
     async def close(self) -> None:
         await super().close()
         await self.h.session.close()
+        await self.h.lc.close()
+        await self.h.renderer.close()
 
     async def login(self, token: str) -> None:
         await super().login(token)
@@ -81,6 +97,9 @@ class Bot(commands.AutoShardedBot):
         if not hasattr(self.h, "session"):
             self.h.session = ClientSession()
 
+        await self.h.lc.setup()
+        await self.h.renderer.setup()
+
         if not self.persistent_views_added:
             for cls in (BookmarkView,):
                 self.add_view(cls())
@@ -92,6 +111,20 @@ class Bot(commands.AutoShardedBot):
         await self.update_activity()
         logging.info(f"Bot is ready as {self.user}.")
 
+        if self._warm_up_task is None:
+            self._warm_up_task = asyncio.create_task(self.warm_up())
+
+    async def warm_up(self) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            await self.h.renderer.warm_up()
+        except Exception:
+            logging.exception("Failed to warm up.")
+            return
+
+        logging.info(f"Warmed up in {time.perf_counter() - started_at:.2f}s.")
+
     async def update_activity(self):
         activity = Activity(
             status=Status.online,
@@ -135,8 +168,17 @@ class Container(containers.DeclarativeContainer):
         port=config.db_port,
         db_name=config.db_name,
         ssl_ca_path=config.ssl_ca_path,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_recycle=config.db_pool_recycle,
+        pool_timeout=config.db_pool_timeout,
+        pool_pre_ping=config.db_pool_pre_ping,
+        statement_timeout=config.db_statement_timeout,
+        echo=config.db_echo,
     )
     srv = providers.Singleton(Service)
+    figure_cache = providers.Singleton(FigureCache, directory=config.figure_cache_dir)
+    renderer = providers.Singleton(FigureRenderer, cache=figure_cache)
 
     h = providers.Singleton(
         Handler,
@@ -144,6 +186,7 @@ class Container(containers.DeclarativeContainer):
         lc=lc,
         config=cfg,
         srv=srv,
+        renderer=renderer,
     )
 
     bot = providers.Factory(
@@ -170,6 +213,14 @@ if __name__ == "__main__":
     container.config.db_port.from_env("DB_PORT", as_=int, default=3306)
     container.config.db_name.from_env("DB_NAME", default="mkbot")
     container.config.ssl_ca_path.from_env("SSL_CA_PATH", default=None)
+    container.config.db_pool_size.from_env("DB_POOL_SIZE", as_=int, default=DEFAULT_POOL_SIZE)
+    container.config.db_max_overflow.from_env("DB_MAX_OVERFLOW", as_=int, default=DEFAULT_MAX_OVERFLOW)
+    container.config.db_pool_recycle.from_env("DB_POOL_RECYCLE", as_=int, default=DEFAULT_POOL_RECYCLE)
+    container.config.db_pool_timeout.from_env("DB_POOL_TIMEOUT", as_=int, default=DEFAULT_POOL_TIMEOUT)
+    container.config.db_pool_pre_ping.from_env("DB_POOL_PRE_PING", as_=parse_bool, default="false")
+    container.config.db_statement_timeout.from_env("DB_STATEMENT_TIMEOUT", as_=int, default=DEFAULT_STATEMENT_TIMEOUT)
+    container.config.db_echo.from_env("DB_ECHO", default="off")
+    container.config.figure_cache_dir.from_env("FIGURE_CACHE_DIR", default=None)
     container.config.webhook_url.from_env("WEBHOOK_URL", required=True)
     container.config.bot_token.from_env("BOT_TOKEN", required=True)
     container.config.command_prefix.from_env("COMMAND_PREFIX", default="!")
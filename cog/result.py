@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from discord import Attachment, SlashCommandGroup, message_command, option
+from discord import Attachment, OptionChoice, SlashCommandGroup, message_command, option
 from discord.ext import commands
 from discord.ext.commands import BucketType, MaxConcurrency
 
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
     from discord import ApplicationContext, Message
 
     from bot import Bot
+    from model.results import ImportMode
 
 
 class ResultCog(Cog, name="Result"):
@@ -58,18 +59,55 @@ class ResultCog(Cog, name="Result"):
             "ja": "戦績のグラフを表示",
         },
     )
-    async def result_graph(self, ctx: ApplicationContext) -> None:
-        return await self.h.result_graph(ctx)
+    @option(
+        name="last",
+        type=int,
+        description="Show only the latest N results.",
+        description_localizations={
+            "ja": "指定した場合, 最新のN件のみを表示",
+        },
+        required=False,
+        default=None,
+        min_value=1,
+    )
+    @option(
+        name="since",
+        type=str,
+        description="Show results on or after this date. (e.g. 2024 6 5 21, 06 05 21, 21)",
+        description_localizations={
+            "ja": "指定した場合, この日時以降の戦績のみを表示 (例: 2024 6 5 21, 06 05 21, 21)",
+        },
+        required=False,
+        default=None,
+    )
+    @option(
+        name="until",
+        type=str,
+        description="Show results on or before this date. (e.g. 2024 6 5 21, 06 05 21, 21)",
+        description_localizations={
+            "ja": "指定した場合, この日時以前の戦績のみを表示 (例: 2024 6 5 21, 06 05 21, 21)",
+        },
+        required=False,
+        default=None,
+    )
+    async def result_graph(
+        self,
+        ctx: ApplicationContext,
+        last: int | None,
+        since: str | None,
+        until: str | None,
+    ) -> None:
+        return await self.h.result_graph(ctx, last=last, since=since, until=until)
 
     @commands.command(
         name="graph",
         description="Show result graph",
         brief="戦績グラフを表示",
-        usage="!graph",
+        usage="!graph [last]",
         hidden=False,
     )
-    async def text_result_graph(self, ctx: commands.Context) -> None:
-        return await self.h.result_graph(ctx)
+    async def text_result_graph(self, ctx: commands.Context, last: int | None = None) -> None:
+        return await self.h.result_graph(ctx, last=last)
 
     @result.command(
         name="register",
@@ -227,8 +265,22 @@ class ResultCog(Cog, name="Result"):
         },
         required=True,
     )
-    async def result_data_import(self, ctx: ApplicationContext, file: Attachment) -> None:
-        return await self.h.result_data_import(ctx, file)
+    @option(
+        type=str,
+        name="mode",
+        parameter_name="mode",
+        name_localizations={"ja": "方法"},
+        description="How to import result data.",
+        description_localizations={"ja": "戦績の読み込み方法"},
+        choices=[
+            OptionChoice(name="replace", name_localizations={"ja": "置き換え"}, value="replace"),
+            OptionChoice(name="merge", name_localizations={"ja": "追加 (重複を除く)"}, value="merge"),
+        ],
+        required=False,
+        default="replace",
+    )
+    async def result_data_import(self, ctx: ApplicationContext, file: Attachment, mode: ImportMode) -> None:
+        return await self.h.result_data_import(ctx, file, mode)
 
 
 def setup(bot: Bot) -> None:
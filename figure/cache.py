@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import pickle
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+__all__ = (
+    "FigureCache",
+    "get_figure_key",
+)
+
+logger = logging.getLogger(__name__)
+
+# 描画関数の処理を変更した場合は, ディスクに残っている古い画像を使わないようにこの値を変更する.
+FIGURE_CACHE_VERSION: Final[int] = 1
+# メモリに保持する画像の合計サイズの上限 (バイト). グラフ1枚あたり数十KB程度.
+MEMORY_CACHE_BYTES: Final[int] = 32 * 1024 * 1024
+# ディスクに保存する画像の合計サイズの上限 (バイト).
+DISK_CACHE_BYTES: Final[int] = 256 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def get_style_digest(filepath: str) -> str:
+    """スタイルファイルの内容のハッシュを返す. スタイルを変更した場合に別の画像として扱うために使う."""
+    with open(filepath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_figure_key(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """描画関数と入力データから, 描画される画像を識別するキーを作成する.
+    同じ関数, スタイル, 入力データ (シーズンなどを含む) からは同じ画像が描画されるため, 同じキーになる.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        描画関数.
+    args : tuple[Any, ...]
+        描画関数に渡す引数.
+    kwargs : dict[str, Any]
+        描画関数に渡すキーワード引数.
+
+    Returns
+    -------
+    str
+        画像を識別するキー. (SHA-256の16進数表記)
+    """
+    h = hashlib.sha256()
+    h.update(f"{FIGURE_CACHE_VERSION}:{func.__module__}.{func.__qualname__}".encode())
+
+    if (style := getattr(func, "__style__", None)) is not None:
+        h.update(get_style_digest(style).encode())
+
+    # 入力データはワーカーに渡すためにpickleできる必要があるため, そのままハッシュに使う.
+    h.update(pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL))
+    return h.hexdigest()
+
+
+class FigureCache:
+    """描画した画像のキャッシュ. 入力データのハッシュをキーとして保持する.
+    メモリ上には合計サイズの上限までLRUで保持し, ディレクトリを指定した場合はディスクにも保存する.
+    """
+
+    __slots__ = (
+        "max_bytes",
+        "directory",
+        "max_disk_bytes",
+        "hits",
+        "misses",
+        "_data",
+        "_size",
+        "_disk_size",
+        "_pruning",
+    )
+
+    if TYPE_CHECKING:
+        max_bytes: int
+        directory: str | None
+        max_disk_bytes: int
+        hits: int
+        misses: int
+        _data: OrderedDict[str, bytes]
+        _size: int
+        # ディスク上の画像の合計サイズ (バイト). 初期化時に1回だけ数え, 以降は書き込みと削除で更新する.
+        _disk_size: int
+        _pruning: bool
+
+    def __init__(
+        self,
+        max_bytes: int = MEMORY_CACHE_BYTES,
+        directory: str | None = None,
+        max_disk_bytes: int = DISK_CACHE_BYTES,
+    ) -> None:
+        """キャッシュを初期化する.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            メモリに保持する画像の合計サイズの上限 (バイト), by default MEMORY_CACHE_BYTES
+        directory : str | None, optional
+            画像を保存するディレクトリ, by default None. Noneの場合はディスクに保存しない.
+        max_disk_bytes : int, optional
+            ディスクに保存する画像の合計サイズの上限 (バイト), by default DISK_CACHE_BYTES
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._size = 0
+        self._disk_size = 0
+        self._pruning = False
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_size = sum(size for _, size, _ in self._scan_disk())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size(self) -> int:
+        """メモリに保持している画像の合計サイズ (バイト)."""
+        return self._size
+
+    async def get(self, key: str) -> bytes | None:
+        """画像を取得する. メモリに無い場合はディスクから読み込む.
+
+        Parameters
+        ----------
+        key : str
+            get_figure_keyで作成したキー.
+
+        Returns
+        -------
+        bytes | None
+            画像のバイナリデータ. 存在しない場合はNone.
+        """
+        if (data := self._data.get(key)) is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return data
+
+        if self.directory is not None:
+            try:
+                data = await asyncio.to_thread(self._read, key)
+            except OSError as e:
+                logger.warning(f"Failed to read cached figure {key}: {e!r}")
+                data = None
+
+            if data is not None:
+                self._put_memory(key, data)
+                self.hits += 1
+                return data
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, data: bytes) -> None:
+        """画像を保存する.
+
+        Parameters
+        ----------
+        key : str
+            get_figure_keyで作成したキー.
+        data : bytes
+            画像のバイナリデータ.
+        """
+        self._put_memory(key, data)
+
+        if self.directory is None:
+            return
+
+        try:
+            self._disk_size += await asyncio.to_thread(self._write, key, data)
+        except OSError as e:
+            logger.warning(f"Failed to write cached figure {key}: {e!r}")
+            return
+
+        # 上限を超えた場合のみディレクトリを走査する. 削除中に書き込まれた分も数えられるよう, 削除した分を差し引く.
+        if self._disk_size > self.max_disk_bytes and not self._pruning:
+            self._pruning = True
+
+            try:
+                self._disk_size -= await asyncio.to_thread(self._prune_disk)
+            except OSError as e:
+                logger.warning(f"Failed to prune cached figures: {e!r}")
+            finally:
+                self._pruning = False
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        # 1枚で上限を超える画像は保持しない.
+        if len(data) > self.max_bytes:
+            return
+
+        if (old := self._data.pop(key, None)) is not None:
+            self._size -= len(old)
+
+        self._data[key] = data
+        self._size += len(data)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, data: bytes) -> int:
+        """画像をディスクに保存し, ディスク上の合計サイズの増分を返す."""
+        path = self._path(key)
+        # 書き込み途中のファイルを読まないよう, 一時ファイルに書き込んでから置き換える.
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+        try:
+            # 同じキーの画像を上書きする場合は, 以前の画像の分を差し引く.
+            old = os.path.getsize(path)
+        except FileNotFoundError:
+            old = 0
+
+        os.replace(tmp, path)
+        return len(data) - old
+
+    def _scan_disk(self) -> list[tuple[float, int, str]]:
+        """ディスク上の画像の (最終更新日時, サイズ, パス) の一覧を返す."""
+        assert self.directory is not None
+        files: list[tuple[float, int, str]] = []
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return files
+
+    def _prune_disk(self) -> int:
+        """ディスク上の画像の合計サイズが上限を超えている場合, 最終更新が古いものから削除し, 削除したサイズを返す."""
+        files = self._scan_disk()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+
+            try:
+                os.remove(path)
+                removed += size
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+        return removed
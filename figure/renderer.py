@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import TYPE_CHECKING, Callable, Final, ParamSpec
+
+from .cache import get_figure_key
+from .types import FigureRenderer as IFigureRenderer
+
+__all__ = ("FigureRenderer",)
+
+if TYPE_CHECKING:
+    from .cache import FigureCache
+
+P = ParamSpec("P")
+
+logger = logging.getLogger(__name__)
+
+# 描画に使うプロセスの数. 1プロセスあたりmatplotlibの分のメモリを使うため少なめにしている.
+RENDER_WORKERS: Final[int] = 2
+# ワーカーに同時に渡す描画の最大数. これを超えた描画はワーカーに渡さずイベントループ上で待たせる.
+MAX_PENDING_RENDERS: Final[int] = 8
+
+
+def init_worker() -> None:
+    """ワーカープロセスの初期化処理. 最初の描画が遅くならないよう, matplotlibと描画関数を読み込んでおく.
+    描画関数はpyplotを使わずFigureCanvasAggに直接描画するため, GUIのバックエンドは読み込まない.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import matplotlib.dates  # noqa: F401
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    import figure.result  # noqa: F401
+    import figure.stats  # noqa: F401
+
+    # フォントは最初に文字を描画するときに読み込まれるため, 小さな図を描画して読み込んでおく.
+    fig = Figure(figsize=(1, 1))
+    fig.text(0, 0, "0")
+    FigureCanvasAgg(fig).draw()
+
+
+class FigureRenderer(IFigureRenderer):
+    """プロセスプールでグラフを描画するレンダラー.
+    キャッシュを指定した場合は, 入力データが同じグラフを描画し直さずに使い回す.
+    """
+
+    __slots__ = (
+        "max_workers",
+        "max_pending",
+        "cache",
+        "_executor",
+        "_inflight",
+        "_slots",
+        "_waiting",
+        "_running",
+    )
+
+    if TYPE_CHECKING:
+        max_workers: int
+        max_pending: int
+        cache: FigureCache | None
+        _executor: ProcessPoolExecutor | None
+        _inflight: dict[str, asyncio.Future[bytes]]
+        _slots: asyncio.Semaphore | None
+        _waiting: int
+        _running: int
+
+    def __init__(
+        self,
+        max_workers: int = RENDER_WORKERS,
+        max_pending: int = MAX_PENDING_RENDERS,
+        cache: FigureCache | None = None,
+    ) -> None:
+        """レンダラーを初期化する. ワーカーはFigureRenderer.setup()で起動する.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            描画に使うプロセスの数, by default RENDER_WORKERS
+        max_pending : int, optional
+            ワーカーに同時に渡す描画の最大数, by default MAX_PENDING_RENDERS
+        cache : FigureCache | None, optional
+            描画した画像のキャッシュ, by default None. Noneの場合は毎回描画する.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.cache = cache
+        self._executor = None
+        self._inflight = {}
+        self._slots = None
+        self._waiting = 0
+        self._running = 0
+
+    async def setup(self) -> None:
+        if self._executor is None:
+            # forkするとイベントループやスレッドのロックの状態まで複製されるため, spawnで新しいプロセスを起動する.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def warm_up(self) -> None:
+        await self.setup()
+        assert self._executor is not None
+
+        # ワーカーは最初にタスクを渡したときに起動し, init_workerでmatplotlibを読み込む.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self._executor, os.getpid) for _ in range(self.max_workers)])
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting + self._running
+
+    async def render(self, func: Callable[P, BytesIO], *args: P.args, **kwargs: P.kwargs) -> BytesIO:
+        if self.cache is None:
+            return await self._render(func, *args, **kwargs)
+
+        key = get_figure_key(func, args, kwargs)
+
+        if (data := await self.cache.get(key)) is not None:
+            return BytesIO(data)
+
+        # 同じグラフの描画が既に行われている場合は, その結果を待つ.
+        if (future := self._inflight.get(key)) is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._render_and_cache(key, func, *args, **kwargs))
+
+            def on_done(f: asyncio.Future[bytes]) -> None:
+                self._inflight.pop(key, None)
+                # 待っている呼び出し元が全てキャンセルされた場合でも, 例外が未処理として警告されないようにする.
+                if not f.cancelled():
+                    f.exception()
+
+            future.add_done_callback(on_done)
+
+        return BytesIO(await asyncio.shield(future))
+
+    async def _render_and_cache(self, key: str, func: Callable[P, BytesIO], *args: P.args, **kwargs: P.kwargs) -> bytes:
+        assert self.cache is not None
+        data = (await self._render(func, *args, **kwargs)).getvalue()
+        await self.cache.set(key, data)
+        return data
+
+    async def _render(self, func: Callable[P, BytesIO], *args: P.args, **kwargs: P.kwargs) -> BytesIO:
+        await self.setup()
+        assert self._slots is not None
+
+        self._waiting += 1
+        queued_at = time.perf_counter()
+
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        started_at = time.perf_counter()
+
+        try:
+            assert self._executor is not None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        except BrokenProcessPool:
+            # ワーカーが異常終了した場合は, 次の描画のためにプロセスプールを作り直す.
+            logger.exception("Render worker died. Restarting the process pool.")
+            await self._restart()
+            raise
+        finally:
+            self._running -= 1
+            self._slots.release()
+            logger.debug(
+                f"Rendered {func.__name__} in {time.perf_counter() - started_at:.3f}s "
+                f"(waited {started_at - queued_at:.3f}s, queue depth: {self.queue_depth})"
+            )
+
+    async def _restart(self) -> None:
+        executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        await self.setup()
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-from io import BytesIO
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, Final, Iterable, TypedDict
 
-import matplotlib.pyplot as plt
 import numpy as np
 
-from .utils import styled
+from .utils import Style, style_value, styled
 
-__all__ = ("create_result_graph",)
+__all__ = (
+    "create_result_graph",
+    "create_result_history",
+    "decimate",
+)
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
+    from matplotlib.axes import Axes
+    from numpy.typing import NDArray
 
     class Result(TypedDict):
+        date: datetime
         score: int
         enemyScore: int
 
@@ -20,35 +27,148 @@ else:
     Result = dict[str, int]
 
 
+# グラフに描画する点の最大数. 戦績がこれより多い場合は間引いて, 描画にかかる時間を一定に保つ.
+MAX_POINTS: Final[int] = 1000
+
+
+def create_result_history(
+    results: Iterable[Result],
+    last: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    max_points: int = MAX_POINTS,
+) -> tuple[NDArray[np.datetime64], NDArray[np.int64]]:
+    """戦績から, グラフに描画する勝ち数 - 負け数の推移を作成する.
+
+    Parameters
+    ----------
+    results : Iterable[Result]
+        戦績. 順番は問わない.
+    last : int | None, optional
+        指定した場合, 最新の戦績からlast件のみを使う, by default None. 1以上である必要がある.
+    since : datetime | None, optional
+        指定した場合, この日時以降の戦績のみを使う, by default None
+    until : datetime | None, optional
+        指定した場合, この日時以前の戦績のみを使う, by default None
+    max_points : int, optional
+        返す点の最大数, by default MAX_POINTS. これより多い場合は推移の形を保つように間引く.
+
+    Returns
+    -------
+    tuple[NDArray[np.datetime64], NDArray[np.int64]]
+        対戦日時と, その時点までの勝ち数 - 負け数. 対戦日時の古い順に並ぶ.
+
+    Raises
+    ------
+    ValueError
+        lastが1未満の場合.
+    """
+    if last is not None and last < 1:
+        raise ValueError(f"last must be a positive integer: {last}")
+
+    results = list(results)
+    dates = np.array([r["date"] for r in results], dtype="datetime64[s]")
+    diffs = np.array([r["score"] - r["enemyScore"] for r in results], dtype=np.int64)
+
+    order = np.argsort(dates, kind="stable")
+    dates, diffs = dates[order], diffs[order]
+
+    mask = np.ones(len(dates), dtype=np.bool_)
+
+    if since is not None:
+        mask &= dates >= np.datetime64(since, "s")
+
+    if until is not None:
+        mask &= dates <= np.datetime64(until, "s")
+
+    dates, diffs = dates[mask], diffs[mask]
+
+    if last is not None:
+        dates, diffs = dates[-last:], diffs[-last:]
+
+    history = np.cumsum(np.sign(diffs))
+    return decimate(dates, history, max_points)
+
+
+def decimate(
+    xs: NDArray[np.datetime64],
+    ys: NDArray[np.int64],
+    max_points: int,
+) -> tuple[NDArray[np.datetime64], NDArray[np.int64]]:
+    """折れ線の形を保ったまま点を間引く.
+    点を区間に分け, 区間ごとに最小値と最大値の点を残す. 最初と最後の点は常に残す.
+
+    Parameters
+    ----------
+    xs : NDArray[np.datetime64]
+        x座標.
+    ys : NDArray[np.int64]
+        y座標.
+    max_points : int
+        残す点のおおよその最大数.
+
+    Returns
+    -------
+    tuple[NDArray[np.datetime64], NDArray[np.int64]]
+        間引いた後のx座標とy座標.
+    """
+    n = len(ys)
+
+    if n <= max_points:
+        return xs, ys
+
+    buckets = max(1, max_points // 2)
+    size = -(-n // buckets)
+    # 区間の大きさを揃えるため, 最後の値で埋めてから区間ごとに並べる.
+    padded = np.concatenate([ys, np.full(buckets * size - n, ys[-1], dtype=ys.dtype)]).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+
+    indices = np.concatenate(
+        [
+            [0, n - 1],
+            offsets + padded.argmin(axis=1),
+            offsets + padded.argmax(axis=1),
+        ]
+    )
+    indices = np.unique(np.minimum(indices, n - 1))
+    return xs[indices], ys[indices]
+
+
 @styled("figure/styles/result.mplstyle")
-def create_result_graph(results: list[Result]) -> BytesIO:
-    """戦績のグラフを作成する.
+def create_result_graph(
+    ax: Axes,
+    style: Style,
+    dates: NDArray[np.datetime64],
+    history: NDArray[np.int64],
+) -> None:
+    """戦績のグラフを作成する. axとstyleはstyledにより渡される.
 
     Parameters
     ----------
-    results : list[Result]
-        戦績のリスト
+    dates : NDArray[np.datetime64]
+        対戦日時. create_result_historyで作成したもの.
+    history : NDArray[np.int64]
+        その時点までの勝ち数 - 負け数. create_result_historyで作成したもの.
 
     Returns
     -------
     BytesIO
         作成したグラフのバイナリデータ
     """
-    xs = np.arange(len(results))
-    win_or_lose = np.sign(np.array([result["score"] - result["enemyScore"] for result in results]))
-    history = np.cumsum(win_or_lose)
-    plt.plot(history, label="Wins - Loses")
-    _, _, y_min, y_max = plt.axis()
-    plt.grid(visible=True, which="both", axis="both", color="gray")
-    plt.legend(bbox_to_anchor=(0, 1))
-    plt.fill_between(xs, y_min, 0, facecolor="#87ceeb", alpha=0.3)
-    plt.fill_between(xs, 0, y_max, facecolor="#ffa07a", alpha=0.3)
-    plt.title("Win&Lose History")
-
-    buffer = BytesIO()
-    plt.savefig(buffer, format="png", bbox_inches="tight")
-    buffer.seek(0)
-
-    plt.clf()
-    plt.close()
-    return buffer
+    ax.plot(dates, history, label="Wins - Loses", linewidth=style_value(style, "lines.linewidth"))
+    _, _, y_min, y_max = ax.axis()
+    ax.grid(visible=True, which="both", axis="both", color="gray", linestyle=style_value(style, "grid.linestyle"))
+    ax.legend(
+        bbox_to_anchor=(0, 1),
+        loc=style_value(style, "legend.loc"),
+        borderaxespad=style_value(style, "legend.borderaxespad"),
+    )
+    ax.fill_between(dates, y_min, 0, facecolor="#87ceeb", alpha=0.3)
+    ax.fill_between(dates, 0, y_max, facecolor="#ffa07a", alpha=0.3)
+    ax.set_title("Win&Lose History")
+
+    from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+
+    locator = AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(ConciseDateFormatter(locator))
@@ -1,17 +1,27 @@
-from io import BytesIO
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from utils.constants import CURRENT_SEASON
 
-from .utils import styled
+from .utils import Style, style_value, styled
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from numpy.typing import NDArray
 
 __all__ = ("create_mmr_history_graph",)
 
 
 @styled("figure/styles/stats.mplstyle")
-def create_mmr_history_graph(mmr_history: list[int], season: int | None = None) -> BytesIO:
+def create_mmr_history_graph(
+    ax: Axes,
+    style: Style,
+    mmr_history: Sequence[int] | NDArray[np.int64],
+    season: int | None = None,
+) -> None:
     if season is None:
         season = CURRENT_SEASON
 
@@ -51,10 +61,15 @@ def create_mmr_history_graph(mmr_history: list[int], season: int | None = None)
         ]
 
     xs = np.arange(len(mmr_history))
-    lines = plt.plot(mmr_history)
-    xmin, xmax, ymin, ymax = plt.axis()
-    plt.ylabel("MMR")
-    plt.grid(True, which="both")
+    ax.plot(mmr_history, linewidth=style_value(style, "lines.linewidth"))
+    xmin, xmax, ymin, ymax = ax.axis()
+    ax.set_ylabel("MMR")
+    ax.grid(
+        True,
+        which="both",
+        color=style_value(style, "grid.color"),
+        linestyle=style_value(style, "grid.linestyle"),
+    )
 
     for i in range(len(ranks)):
         if ranks[i] > ymax:
@@ -69,14 +84,8 @@ def create_mmr_history_graph(mmr_history: list[int], season: int | None = None)
             minfill = ymin
         else:
             minfill = ranks[i]
-        plt.fill_between(xs, minfill, maxfill, color=colors[i])
+        ax.fill_between(xs, minfill, maxfill, color=colors[i])
         divide = [i for i in colors_between if minfill <= i <= maxfill]
-        plt.hlines(divide, xmin, xmax, colors="snow", linestyle="solid", linewidth=1)
+        ax.hlines(divide, xmin, xmax, colors="snow", linestyle="solid", linewidth=1)
 
-    plt.fill_between(xs, ymin, mmr_history, facecolor="#212121", alpha=0.4)
-    fp = BytesIO()
-    plt.savefig(fp, format="png", bbox_inches="tight")
-    fp.seek(0)
-    plt.clf()
-    plt.close()
-    return fp
+    ax.fill_between(xs, ymin, mmr_history, facecolor="#212121", alpha=0.4)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from typing import TYPE_CHECKING, Callable, ParamSpec
+
+__all__ = ("FigureRenderer",)
+
+if TYPE_CHECKING:
+    from io import BytesIO
+
+P = ParamSpec("P")
+
+
+class FigureRenderer(metaclass=ABCMeta):
+    """グラフの描画をイベントループの外で行うレンダラー.
+    matplotlibの描画は数百ミリ秒かかるため, イベントループ上で行うと他のコマンドやハートビートが止まってしまう.
+    """
+
+    @abstractmethod
+    async def setup(self) -> None:
+        """描画に使うワーカーを起動する."""
+        ...
+
+    @abstractmethod
+    async def warm_up(self) -> None:
+        """全てのワーカーを起動し, matplotlibを読み込ませておく. 最初の描画が遅くならないようにするために使う."""
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """ワーカーを終了する. 描画中のグラフは完了するまで待つ."""
+        ...
+
+    @abstractmethod
+    async def render(self, func: Callable[P, BytesIO], *args: P.args, **kwargs: P.kwargs) -> BytesIO:
+        """グラフを描画する関数をワーカーで実行し, 結果を返す.
+        待っている描画が上限に達している場合は, 空きができるまで待つ.
+
+        Parameters
+        ----------
+        func : Callable[P, BytesIO]
+            グラフを描画する関数. ワーカーに渡すため, モジュールのトップレベルで定義されている必要がある.
+        *args : P.args
+            関数に渡す引数. pickleできる必要がある.
+        **kwargs : P.kwargs
+            関数に渡すキーワード引数. pickleできる必要がある.
+
+        Returns
+        -------
+        BytesIO
+            描画されたグラフのバイナリデータ.
+        """
+        ...
+
+    @property
+    @abstractmethod
+    def queue_depth(self) -> int:
+        """描画中または描画を待っているグラフの数."""
+        ...
@@ -1,16 +1,63 @@
-from typing import Callable, ParamSpec, TypeVar
+from __future__ import annotations
 
-import matplotlib as mpl
+import functools
+import threading
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Callable, Concatenate, Mapping, ParamSpec, cast
 
-__all__ = ("styled",)
+__all__ = (
+    "Style",
+    "styled",
+    "load_style",
+    "style_value",
+)
+
+# matplotlibは読み込みに時間がかかるため, Botの起動時ではなく初めて描画するときに読み込む.
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
 
 P = ParamSpec("P")
-T = TypeVar("T")
+
+Style = dict[str, Any]
+
+# スレッドごとに使い回すFigure. 描画のたびにFigureとキャンバスを作り直さないようにする.
+_local = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def load_style(filepath: str) -> Style:
+    """スタイルファイルを読み込む. 読み込んだ結果はキャッシュされる.
+
+    Parameters
+    ----------
+    filepath : str
+        スタイルファイルのパス
+
+    Returns
+    -------
+    Style
+        スタイルファイルに書かれている設定.
+    """
+    import matplotlib as mpl
+
+    # RcParamsのキーは既知の設定名のLiteralとして型付けされているため, 任意の文字列をキーとして扱えるようにする.
+    return dict(cast("Mapping[str, Any]", mpl.rc_params_from_file(filepath, use_default_template=False)))
 
 
-def styled(filepath: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
-    """mpl.rc_contextを使ってmatplotlibのスタイルを変更するデコレータ.
-    グローバルではなく関数内でのみスタイルを変更する.
+def style_value(style: Style, key: str) -> Any:
+    """スタイルの設定値を返す. スタイルファイルに無い場合はmatplotlibの設定値を返す."""
+    import matplotlib as mpl
+
+    return style[key] if key in style else cast("Mapping[str, Any]", mpl.rcParams)[key]
+
+
+def styled(filepath: str) -> Callable[[Callable[Concatenate[Axes, Style, P], None]], Callable[P, BytesIO]]:
+    """スタイルを適用したAxesに描画し, PNG画像として返す関数にするデコレータ.
+    mpl.rc_contextやpyplotのようなグローバルな状態を使わず, スタイルはFigureとAxesに直接適用する.
+    そのため, 別々のスレッドから同時に呼び出しても安全に描画できる.
+
+    デコレートされる関数は, 描画先のAxesと読み込んだスタイルを最初の2つの引数として受け取る.
 
     Parameters
     ----------
@@ -19,15 +66,68 @@ def styled(filepath: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
 
     Returns
     -------
-    Callable[[Callable[P, T]], Callable[P, T]]
+    Callable[[Callable[Concatenate[Axes, Style, P], None]], Callable[P, BytesIO]]
         デコレータ
     """
 
-    def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            with mpl.rc_context(fname=filepath):
-                return func(*args, **kwargs)
+    def decorator(func: Callable[Concatenate[Axes, Style, P], None]) -> Callable[P, BytesIO]:
+        # プロセスプールに渡せるよう, 元の関数と同じ名前でpickleされるようにする.
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> BytesIO:
+            style = load_style(filepath)
+            fig = get_figure(style)
 
+            try:
+                ax = fig.add_subplot()
+                apply_axes_style(ax, style)
+                func(ax, style, *args, **kwargs)
+
+                buffer = BytesIO()
+                fig.savefig(
+                    buffer,
+                    format="png",
+                    bbox_inches="tight",
+                    facecolor=style_value(style, "savefig.facecolor"),
+                    edgecolor=style_value(style, "savefig.edgecolor"),
+                )
+                buffer.seek(0)
+                return buffer
+            finally:
+                fig.clear()
+
+        # 描画した画像のキャッシュで, スタイルが変わった場合に別の画像として扱うために使う.
+        wrapper.__style__ = filepath  # type: ignore
         return wrapper
 
     return decorator
+
+
+def get_figure(style: Style) -> Figure:
+    """現在のスレッドで使い回すFigureを取得し, スタイルの背景色を設定する."""
+    fig: Figure | None = getattr(_local, "figure", None)
+
+    if fig is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = _local.figure = Figure()
+        FigureCanvasAgg(fig)
+
+    fig.set_facecolor(style_value(style, "figure.facecolor"))
+    fig.set_edgecolor(style_value(style, "figure.edgecolor"))
+    return fig
+
+
+def apply_axes_style(ax: Axes, style: Style) -> None:
+    """スタイルのうち, Axesの作成時にrcParamsから読み込まれる設定をAxesに適用する."""
+    ax.set_facecolor(style_value(style, "axes.facecolor"))
+    ax.set_prop_cycle(style_value(style, "axes.prop_cycle"))
+
+    for spine in ax.spines.values():
+        spine.set_edgecolor(style_value(style, "axes.edgecolor"))
+
+    ax.tick_params(axis="x", colors=style_value(style, "xtick.color"))
+    ax.tick_params(axis="y", colors=style_value(style, "ytick.color"))
+    ax.xaxis.label.set_color(style_value(style, "axes.labelcolor"))
+    ax.yaxis.label.set_color(style_value(style, "axes.labelcolor"))
+    ax.title.set_color(style_value(style, "text.color"))
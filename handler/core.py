@@ -25,15 +25,15 @@ class BaseHandler(IBaseHandler):
         season: Season | None = None,
     ) -> list[tuple[int, Player | None]]:
 
-        async def get_player(user_id: int) -> tuple[int, Player | None]:
-            lounge_id = await self.repo.get_lounge_id(user_id)
-            linked_id = lounge_id or user_id
-            player = await self.lc.get_player(discord_id=linked_id, season=season)
+        lounge_ids = await self.repo.get_lounge_ids(user_ids)
+        linked_ids = [lounge_ids[user_id] or user_id for user_id in user_ids]
+        players = await self.lc.get_players_by_discord_ids(linked_ids, season=season)
+
+        for user_id, player in zip(user_ids, players):
             if player is not None:
                 player.link_id(user_id)
-            return user_id, player
 
-        return await asyncio.gather(*[get_player(user_id) for user_id in user_ids])
+        return list(zip(user_ids, players))
 
     async def get_players_by_friend_codes(
         self,
@@ -54,4 +54,5 @@ class BaseHandler(IBaseHandler):
     async def setup_repository(self) -> None:
         repo = await self.config.get_repository()
         self.repo = repo
+        self.lc.set_store(repo)
         logging.info("Repository setup completed.")
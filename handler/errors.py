@@ -13,8 +13,10 @@ __all__ = (
     "FailedToGetMemberData",
     "GuildNotFound",
     "InvalidCSVFile",
+    "InvalidCSVRow",
     "InvalidDatetimeInput",
     "InvalidGameMessage",
+    "InvalidResultCount",
     "InvalidScoreInput",
     "LoginRequired",
     "NoBookmarkRegistered",
@@ -37,6 +39,7 @@ __all__ = (
 
 if TYPE_CHECKING:
     from utils.constants import LocaleDict
+    from utils.result_csv import ResultColumn
 
 
 class EnemyNameNotFound(BotError):
@@ -56,6 +59,33 @@ class EnemyNameNotFound(BotError):
         super().__init__(message)
 
 
+class InvalidCSVRow(BotError):
+    """戦績のCSVファイルに正しくない行があった場合のエラー."""
+
+    def __init__(self, line: int, column: ResultColumn | None = None) -> None:
+        names: dict[ResultColumn, LocaleDict] = {
+            "team": {"ja": "チーム名", "en-US": "team name"},
+            "score": {"ja": "自チームの得点", "en-US": "score"},
+            "enemyScore": {"ja": "相手チームの得点", "en-US": "enemy score"},
+            "enemy": {"ja": "相手チーム名", "en-US": "enemy name"},
+            "date": {"ja": "対戦日時", "en-US": "date"},
+        }
+
+        if column is None:
+            message: LocaleDict = {
+                "ja": f"CSVファイルの{line}行目の列の数が正しくありません",
+                "en-US": f"Invalid number of columns at line {line} of the CSV file",
+            }
+        else:
+            name = names[column]
+            message = {
+                "ja": f"CSVファイルの{line}行目の{name['ja']}が正しくありません",
+                "en-US": f"Invalid {name['en-US']} at line {line} of the CSV file",
+            }
+
+        super().__init__(message)
+
+
 # なるべくアルファベット順に並べる
 BookmarkLimitExceeded = BotError(
     {
@@ -114,6 +144,13 @@ InvalidGameMessage = BotError(
     }
 )
 
+InvalidResultCount = BotError(
+    {
+        "ja": "戦績の数は1以上の整数で指定してください",
+        "en-US": "Please specify the number of results as an integer of 1 or more",
+    }
+)
+
 InvalidScoreInput = BotError(
     {
         "ja": "<自チームの得点> <相手チームの得点: 省略可能> の形式で入力してください. 例: `10 5`",
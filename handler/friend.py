@@ -19,6 +19,7 @@ from utils.utils import get_average
 
 from .errors import LoginRequired, NoFriendCodeFound, NoViewablePlayers, TooManyFriendCodes
 from .types import BaseHandler as IBaseHandler, FriendHandler as IFriendHandler
+from .utils import format_percentile
 
 __all__ = ("FriendHandler",)
 
@@ -153,7 +154,7 @@ class FriendHandler(IBaseHandler, IFriendHandler):
 
             lines.append(line)
 
-        lines.append(f"\n**Rank**: {rank.name}")
+        lines.append(f"\n**Rank**: {rank.name}{format_percentile(self.lc, average, None, attribute)}")
         embed.description = "\n".join(lines)
 
         options: Options = {"embed": embed}
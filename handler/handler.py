@@ -12,6 +12,7 @@ from .team import TeamHandler
 from .utility import UtilityHandler
 
 if TYPE_CHECKING:
+    from figure.types import FigureRenderer as IFigureRenderer
     from mk8dx.lounge.types.client import LoungeClient as ILoungeClient
     from repository.config import Config
     from service.types.services import Service as IService
@@ -30,9 +31,17 @@ class Handler(
     TeamHandler,
     UtilityHandler,
 ):
-    def __init__(self, config: Config, webhook_token: str, lc: ILoungeClient, srv: IService) -> None:
+    def __init__(
+        self,
+        config: Config,
+        webhook_token: str,
+        lc: ILoungeClient,
+        srv: IService,
+        renderer: IFigureRenderer,
+    ) -> None:
         # RepositoryはBotの起動後にセットアップする.
         self._webhook_token = webhook_token
         self.config = config
         self.lc = lc
         self.srv = srv
+        self.renderer = renderer
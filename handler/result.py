@@ -1,26 +1,32 @@
 from __future__ import annotations
 
+import csv
+import gzip
+import io
+import tempfile
 from datetime import timedelta
-from io import BytesIO
-from typing import TYPE_CHECKING, TypedDict
+from itertools import chain
+from typing import TYPE_CHECKING, AsyncIterable, BinaryIO, Final, TypedDict
 
-import pandas as pd
 from discord import ApplicationContext, Attachment, Embed, EmbedAuthor, EmbedField, File
-from discord.ext.commands import Paginator
 
-from figure.result import create_result_graph
+from figure.result import create_result_graph, create_result_history
 from mk8dx.game import Game
 from utils.constants import EmbedColor
 from utils.constants.timezone import get_offset
-from utils.format import format_result_datetime as fmt_date, format_scores, win_or_lose
+from utils.format import format_result_datetime as fmt_date, format_scores, truncate_text
 from utils.parser import get_datetime, parse_natural_numbers
+from utils.result_csv import InvalidResultRow, parse_results_csv
+from utils.result_table import create_result_table, find_similar_enemies
 
 from .errors import (
     EnemyNameNotFound,
     GuildNotFound,
     InvalidCSVFile,
+    InvalidCSVRow,
     InvalidDatetimeInput,
     InvalidGameMessage,
+    InvalidResultCount,
     InvalidScoreInput,
     NoParametersSpecified,
     NotCSVFile,
@@ -28,7 +34,7 @@ from .errors import (
     ResultNotFound,
 )
 from .types import BaseHandler as IBaseHandler, ResultHandler as IResultHandler
-from .utils import SimplifiedPaginator
+from .utils import LazyPaginator
 
 __all__ = ("ResultHandler",)
 
@@ -37,7 +43,8 @@ if TYPE_CHECKING:
 
     from discord import Message
 
-    from model.results import ResultItem, ResultItemWithID, Results
+    from model.results import ImportMode, ResultCursor, ResultItem, ResultItemWithID, ResultSummary
+    from repository.types.repository import Repository as IRepository
     from utils.types import HybridContext
 
     class UpdateResultParams(TypedDict, total=False):
@@ -48,6 +55,17 @@ if TYPE_CHECKING:
 
 
 TOTAL_SCORE = 984
+# 戦績をエクスポートする際に, データベースから一度に読み込む戦績の数.
+EXPORT_CHUNK_SIZE: Final[int] = 1000
+# 戦績の数がこれ以上の場合は, gzipで圧縮したCSVファイルをエクスポートする.
+EXPORT_GZIP_THRESHOLD: Final[int] = 10000
+# 戦績の一覧の1ページに表示する戦績の数.
+RESULT_PAGE_SIZE: Final[int] = 25
+# 戦績の一覧に表示する相手チームの名前の最大の文字数.
+# 1行は最大で ID 10 + 得点 11 + 名前 + 勝敗 4 + 区切りと改行 4 文字になり, 25行でもメッセージの上限 (2000文字) に収まるようにする.
+RESULT_ENEMY_WIDTH: Final[int] = 24
+# 戦績をインポートする際に, 1回のINSERT文で追加する戦績の数.
+IMPORT_BATCH_SIZE: Final[int] = 1000
 
 
 class ResultHandler(IBaseHandler, IResultHandler):
@@ -57,37 +75,49 @@ class ResultHandler(IBaseHandler, IResultHandler):
         if ctx.guild_id is None:
             raise GuildNotFound
 
-        results = await self.repo.get_results(ctx.guild_id)
+        summary = await self.repo.get_result_summary(ctx.guild_id, enemy=enemy)
 
-        if not results:
-            raise ResultNotFound
+        if summary["count"] == 0:
+            if enemy is None or await self.repo.count_results(ctx.guild_id) == 0:
+                raise ResultNotFound
+
+            raise EnemyNameNotFound(find_similar_enemies(await self.repo.get_enemy_names(ctx.guild_id), enemy))
 
-        df = to_result_df(results)
-        paginator = create_result_paginator(df, enemy=enemy)
+        paginator = create_result_paginator(self.repo, ctx.guild_id, summary, enemy=enemy)
 
         await paginator.respond(ctx.interaction)
 
-    async def result_graph(self, ctx: HybridContext) -> None:
+    async def result_graph(
+        self,
+        ctx: HybridContext,
+        last: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> None:
         if isinstance(ctx, ApplicationContext):
             await ctx.defer()
 
         if not (ctx.guild is not None and ctx.guild.id is not None):
             raise GuildNotFound
 
+        locale = ctx.locale if isinstance(ctx, ApplicationContext) else None
+        since_dt = get_datetime(since, locale) if since is not None else None
+        until_dt = get_datetime(until, locale) if until is not None else None
+
+        if (since is not None and since_dt is None) or (until is not None and until_dt is None):
+            raise InvalidDatetimeInput
+
+        # テキストコマンドではスラッシュコマンドのmin_valueが効かないため, ここで確認する.
+        if last is not None and last < 1:
+            raise InvalidResultCount
+
         results = await self.repo.get_results(ctx.guild.id)
+        dates, history = create_result_history(results, last=last, since=since_dt, until=until_dt)
 
-        if not results:
+        if len(history) == 0:
             raise ResultNotFound
 
-        buffer = create_result_graph(
-            [
-                {
-                    "score": result["score"],
-                    "enemyScore": result["enemyScore"],
-                }
-                for result in results
-            ]
-        )
+        buffer = await self.renderer.render(create_result_graph, dates, history)
         file = File(buffer, filename="result.png")
 
         if isinstance(ctx, ApplicationContext):
@@ -166,12 +196,12 @@ class ResultHandler(IBaseHandler, IResultHandler):
             raise GuildNotFound
 
         if id is None:
-            results = await self.repo.get_results(ctx.guild_id)
+            results = await self.repo.get_latest_results(ctx.guild_id)
 
             if not results:
                 raise ResultNotFound
 
-            target: ResultItemWithID = results[-1]
+            target: ResultItemWithID = results[0]
             id = target["id"]
         else:
             _target = await self.repo.get_result(ctx.guild_id, id)
@@ -217,12 +247,12 @@ class ResultHandler(IBaseHandler, IResultHandler):
             raise GuildNotFound
 
         if id is None:
-            results = await self.repo.get_results(guild_id)
+            results = await self.repo.get_latest_results(guild_id)
 
             if not results:
                 raise ResultNotFound
 
-            current = results[-1]
+            current = results[0]
             original: ResultItemWithID = current.copy()
             id = current["id"]
         else:
@@ -294,159 +324,149 @@ class ResultHandler(IBaseHandler, IResultHandler):
         if ctx.guild is None or ctx.guild.id is None:
             raise GuildNotFound
 
-        results = await self.repo.get_results(ctx.guild.id)
+        count = await self.repo.count_results(ctx.guild.id)
 
-        if not results:
+        if count == 0:
             raise ResultNotFound
 
         team_name = await self.repo.get_team_name(ctx.guild.id) or ctx.guild.name
+        compress = count >= EXPORT_GZIP_THRESHOLD
 
-        # TODO: CSVセーフなチーム名に変換する
-
-        df = pd.DataFrame(results)
-        df.insert(0, "team", team_name)
-
-        buffer = BytesIO()
-        df.to_csv(buffer, index=False, header=False, columns=["team", "score", "enemyScore", "enemy", "date"])
-        buffer.seek(0)
-
-        file = File(buffer, filename="results.csv")
+        # 戦績の数によらずメモリの使用量を一定にするため, 一時ファイルに少しずつ書き込む.
+        with tempfile.TemporaryFile() as fp:
+            await write_results_csv(fp, team_name, self.repo.iter_results(ctx.guild.id, EXPORT_CHUNK_SIZE), compress)
+            fp.seek(0)
 
-        await ctx.respond(file=file)
+            file = File(fp, filename="results.csv.gz" if compress else "results.csv")
+            await ctx.respond(file=file)
 
-    async def result_data_import(self, ctx: ApplicationContext, file: Attachment) -> None:
+    async def result_data_import(self, ctx: ApplicationContext, file: Attachment, mode: ImportMode = "replace") -> None:
         await ctx.defer()
 
-        extension = file.filename.split(".")[-1]
-        if extension != "csv":
+        filename = file.filename.lower()
+        compressed = filename.endswith(".csv.gz")
+
+        if not (compressed or filename.endswith(".csv")):
             raise NotCSVFile
 
         if ctx.guild_id is None:
             raise GuildNotFound
 
-        buffer = BytesIO()
-        await file.save(buffer)
+        with tempfile.TemporaryFile() as fp:
+            await file.save(fp)
+            fp.seek(0)
 
-        try:
-            df = pd.read_csv(
-                buffer,
-                skipinitialspace=True,
-                header=None,
-                dtype={0: str, 1: int, 2: int, 3: str},
-                keep_default_na=False,  # 例えば、チーム名が"null"のような場合にNaNとしてパースしないようにする
-            ).loc[:, [1, 2, 3, 4]]
-            df.columns = ["score", "enemyScore", "enemy", "date"]
-            df = df.copy()
-            df["date"] = pd.to_datetime(df["date"])
-        except Exception:
-            raise InvalidCSVFile from None
+            raw: BinaryIO = gzip.GzipFile(fileobj=fp, mode="rb") if compressed else fp  # type: ignore
+            # 表計算ソフトで保存したファイルのBOMを読み飛ばす.
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
 
-        results = to_list(df)
-        await self.repo.put_results(ctx.guild_id, results)
+            try:
+                batches = parse_results_csv(text, IMPORT_BATCH_SIZE, offset=get_offset(ctx.locale))
 
-        await ctx.respond("戦績ファイルを読みこみました.")
+                # 戦績が1件も無いファイルは, 既存の戦績を削除する前に拒否する.
+                if (first := next(batches, None)) is None:
+                    raise InvalidCSVFile
 
+                summary = await self.repo.import_results(ctx.guild_id, chain([first], batches), mode)
+            except InvalidResultRow as e:
+                raise InvalidCSVRow(e.line, e.column) from None
+            except (UnicodeDecodeError, gzip.BadGzipFile, EOFError, csv.Error):
+                raise InvalidCSVFile from None
+            finally:
+                text.detach()
 
-def to_result_df(results: list[ResultItemWithID]) -> pd.DataFrame:
-    """戦績をデータフレームに変換する. 日付の昇順でソートされる. 重複したデータは削除される.
-
-    Parameters
-    ----------
-    results : Results
-        戦績のデータ. 少なくとも1つの戦績が含まれている必要がある.
-
-    Returns
-    -------
-    pd.DataFrame
-        戦績のデータフレーム. 日付の昇順でソートされている. dateキーの値はdatetime型に変換されている.
-    """
-    df = pd.DataFrame(results)
-    df = df.copy()
-    df["score"] = df["score"]
-    df["enemyScore"] = df["enemyScore"]
-    return df
+        if mode == "merge":
+            await ctx.respond(f"戦績ファイルを読みこみました. (追加: {summary['inserted']}件, 重複: {summary['skipped']}件)")
+        else:
+            await ctx.respond(f"戦績ファイルを読みこみました. ({summary['inserted']}件)")
 
 
-def to_list(result_df: pd.DataFrame) -> Results:
-    """戦績のデータフレームを日付の昇順にソートしたあと, リストに変換する. 重複したデータは削除される.
+async def write_results_csv(
+    fp: BinaryIO,
+    team_name: str,
+    chunks: AsyncIterable[list[ResultItemWithID]],
+    compress: bool = False,
+) -> None:
+    """戦績をCSV形式で書き込む. 戦績は読み込んだ分から順に書き込むため, 全ての戦績をメモリに保持しない.
+    各行は `チーム名,自チームの得点,相手チームの得点,相手チーム名,対戦日時` の形式で, ヘッダーは書き込まない.
 
     Parameters
     ----------
-    result_df : pd.DataFrame
-        データフレーム
-
-    Returns
-    -------
-    list[dict[str, Any]]
-        リスト
+    fp : BinaryIO
+        書き込み先のファイル.
+    team_name : str
+        チーム名.
+    chunks : AsyncIterable[list[ResultItemWithID]]
+        戦績のリストを返す非同期イテレータ.
+    compress : bool, optional
+        gzipで圧縮するかどうか, by default False
     """
-    return result_df.to_dict(orient="records")
-
-
-def create_result_paginator(results: pd.DataFrame, enemy: str | None = None) -> SimplifiedPaginator:
+    raw: BinaryIO = gzip.GzipFile(fileobj=fp, mode="wb") if compress else fp  # type: ignore
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    writer = csv.writer(text, lineterminator="\n")
+
+    try:
+        async for chunk in chunks:
+            writer.writerows((team_name, r["score"], r["enemyScore"], r["enemy"], r["date"]) for r in chunk)
+    finally:
+        # TextIOWrapperを閉じると書き込み先のファイルも閉じられるため, 切り離してから圧縮を終了する.
+        text.flush()
+        text.detach()
+
+        if compress:
+            raw.close()
+
+
+def create_result_paginator(
+    repo: IRepository,
+    guild_id: int,
+    summary: ResultSummary,
+    enemy: str | None = None,
+) -> LazyPaginator:
     """戦績を表示するためのページを作成する.
+    各ページの戦績は, ページを表示するときにデータベースから読み込む.
 
     Parameters
     ----------
-    results : pd.DataFrame
-        戦績のデータフレーム
+    repo : IRepository
+        戦績を読み込むリポジトリ
+    guild_id : int
+        サーバーのID
+    summary : ResultSummary
+        表示する戦績の数と勝敗の数. 戦績の数は1以上である必要がある.
     enemy : str, optional
         絞り込む相手の名前, by default None
 
     Returns
     -------
-    SimplifiedPaginator
+    LazyPaginator
         戦績を表示するためのページ
-
-    Raises
-    ------
-    EnemyNameNotFound
-        指定された相手の名前が見つからない場合
     """
-    if enemy is not None:
-        df = results.query(f"enemy == '{enemy}'").copy()
-
-        if df.empty:
-            name_prefix = enemy[0].lower()
-            enemy_names: list[str] = results["enemy"].unique().tolist()
-            similar = [n for n in enemy_names if n[0].lower() == name_prefix]
-            raise EnemyNameNotFound(similar)
-
-    else:
-        df = results.copy()
-
-    df["fmt_score"] = df["score"].astype(str) + " - " + df["enemyScore"].astype(str)
-    df["diff"] = df["score"] - df["enemyScore"]
-    df["fmt_date"] = df["date"].dt.strftime("%Y/%m/%d")
-
-    if enemy is not None:
-        columns = ["id", "fmt_date", "fmt_score", "diff"]
-    else:
-        columns = ["id", "fmt_score", "enemy", "diff"]
-
-    lines = df.to_string(
-        columns=columns,
-        formatters={"diff": win_or_lose},
-        header=False,
-        justify="center",
-        index=False,
-    ).split("\n")
-
-    win, lose, draw = (
-        df[df["diff"] > 0].shape[0],
-        df[df["diff"] < 0].shape[0],
-        df[df["diff"] == 0].shape[0],
-    )
-
-    footer = f"__**Win**__:  {win}  __**Lose**__:  {lose}  __**Draw**__:  {draw}  [{len(df)}]"
-
-    title = f"vs.  **{enemy}**" if enemy is not None else ""
+    win, lose, draw, count = summary["win"], summary["lose"], summary["draw"], summary["count"]
+    footer = f"__**Win**__:  {win}  __**Lose**__:  {lose}  __**Draw**__:  {draw}  [{count}]"
+
+    title = f"vs.  **{truncate_text(enemy, RESULT_ENEMY_WIDTH)}**" if enemy is not None else ""
     prefix = f"{title}```"
     suffix = f"```{footer}"
 
-    paginator = Paginator(prefix=prefix, suffix=suffix, max_size=900)
+    # 各ページの続きを読み込むための位置. 前のページを読み込んでいないページはOFFSETで読み込む.
+    cursors: dict[int, ResultCursor] = {}
+
+    async def load_page(page_number: int) -> str:
+        before = cursors.get(page_number - 1)
+        results = await repo.get_results_page(
+            guild_id,
+            RESULT_PAGE_SIZE,
+            before=before,
+            offset=page_number * RESULT_PAGE_SIZE if before is None else 0,
+            enemy=enemy,
+        )
+
+        if results:
+            cursors[page_number] = (results[-1]["date"], results[-1]["id"])
 
-    for line in lines:
-        paginator.add_line(line)
+        table = create_result_table(results, enemy=enemy, max_enemy_width=RESULT_ENEMY_WIDTH)
+        return "\n".join([prefix, *table.lines, suffix])
 
-    return SimplifiedPaginator(pages=paginator.pages)
+    page_count = -(-count // RESULT_PAGE_SIZE)
+    return LazyPaginator(page_count, load_page)
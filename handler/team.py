@@ -9,7 +9,7 @@ from utils.utils import drop_duplicates, get_average
 
 from .errors import GuildNotFound, NoViewablePlayers, TeamNameNotSet
 from .types import BaseHandler as IBaseHandler, TeamHandler as ITeamHandler
-from .utils import EmbedPaginator, SimplifiedPaginator
+from .utils import EmbedPaginator, SimplifiedPaginator, format_percentile
 
 __all__ = ("TeamHandler",)
 
@@ -54,7 +54,7 @@ class TeamHandler(IBaseHandler, ITeamHandler):
         embeds = page.to_embeds(
             title=title,
             header=header,
-            footer=f"Rank: {rank.name}",
+            footer=f"Rank: {rank.name}{format_percentile(self.lc, avg, season, 'mmr')}",
             color=rank.color,
             thumbnail=rank.url,
         )
@@ -99,7 +99,7 @@ class TeamHandler(IBaseHandler, ITeamHandler):
         embeds = page.to_embeds(
             title=title,
             header=header,
-            footer=f"Rank: {rank.name}",
+            footer=f"Rank: {rank.name}{format_percentile(self.lc, avg, season, 'max_mmr')}",
             color=rank.color,
             thumbnail=rank.url,
         )
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from aiohttp import ClientSession
     from discord import Webhook
 
+    from figure.types import FigureRenderer as IFigureRenderer
     from mk8dx.lounge.player import Player
     from mk8dx.lounge.types.client import LoungeClient as ILoungeClient
     from repository.config import Config
@@ -28,6 +29,7 @@ class BaseHandler(metaclass=ABCMeta):
         lc: ILoungeClient
         repo: IRepository
         srv: IService
+        renderer: IFigureRenderer
         session: ClientSession
         _webhook_token: str
 
@@ -17,6 +17,7 @@ from . import (
 __all__ = ("Handler",)
 
 if TYPE_CHECKING:
+    from figure.types import FigureRenderer as IFigureRenderer
     from mk8dx.lounge.types.client import LoungeClient as ILoungeClient
     from repository.types.repository import Repository as IRepository
     from service.types.services import Service as IService
@@ -39,4 +40,5 @@ class Handler(
         lc: ILoungeClient,
         repo: IRepository,
         srv: IService,
+        renderer: IFigureRenderer,
     ) -> None: ...
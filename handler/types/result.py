@@ -8,6 +8,7 @@ __all__ = ("ResultHandler",)
 if TYPE_CHECKING:
     from discord import ApplicationContext, Attachment, Message
 
+    from model.results import ImportMode
     from utils.types import HybridContext
 
 
@@ -26,13 +27,25 @@ class ResultHandler(metaclass=ABCMeta):
         ...
 
     @abstractmethod
-    async def result_graph(self, ctx: HybridContext) -> None:
-        """戦績をグラフで表示する.
+    async def result_graph(
+        self,
+        ctx: HybridContext,
+        last: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> None:
+        """戦績をグラフで表示する. 期間を指定しない場合は全ての戦績を表示する.
 
         Parameters
         ----------
         ctx : HybridContext
             コマンドのコンテキスト.
+        last : int | None, optional
+            指定した場合, 最新の戦績からlast件のみを表示する, by default None
+        since : str | None, optional
+            指定した場合, この日時以降の戦績のみを表示する, by default None
+        until : str | None, optional
+            指定した場合, この日時以前の戦績のみを表示する, by default None
         """
         ...
 
@@ -117,14 +130,17 @@ class ResultHandler(metaclass=ABCMeta):
         ...
 
     @abstractmethod
-    async def result_data_import(self, ctx: ApplicationContext, file: Attachment) -> None:
+    async def result_data_import(self, ctx: ApplicationContext, file: Attachment, mode: ImportMode = "replace") -> None:
         """戦績データをCSVファイルからインポートする.
+        ファイルは少しずつ読み込みながら検証し, 正しくない行があった場合は戦績を変更しない.
 
         Parameters
         ----------
         ctx : ApplicationContext
             コマンドのコンテキスト.
         file : Attachment
-            インポートするファイル.
+            インポートするファイル. (CSV形式, またはgzipで圧縮したCSV形式)
+        mode : ImportMode, optional
+            "replace"の場合は既存の戦績を置き換え, "merge"の場合は重複しない戦績のみを追加する, by default "replace"
         """
         ...
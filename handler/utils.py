@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal
 
 from discord import Color, Embed
 from discord.ext import commands
@@ -8,15 +8,19 @@ from discord.ext.pages import Paginator
 
 from utils.constants import EmbedColor
 
-__all__ = ("SimplifiedPaginator", "EmbedPaginator")
+__all__ = ("SimplifiedPaginator", "LazyPaginator", "EmbedPaginator", "format_percentile")
 
 if TYPE_CHECKING:
     from datetime import datetime
 
+    from discord import Interaction, Message, WebhookMessage
     from discord.embeds import EmbedAuthor, EmbedFooter, EmbedMedia, EmbedType
     from discord.ext.pages import Page, PageGroup, PaginatorButton
     from discord.ui import View
 
+    from mk8dx.lounge.types.client import LoungeClient as ILoungeClient
+    from utils.constants import Season
+
 
 class SimplifiedPaginator(Paginator):
     """1ページしかページが存在しない場合にコンパクトな表示を行うPaginator.
@@ -57,6 +61,53 @@ class SimplifiedPaginator(Paginator):
         )
 
 
+class LazyPaginator(SimplifiedPaginator):
+    """ページを表示するときに初めて内容を読み込むPaginator.
+    全てのページを最初に作成せず, ページをめくったときに必要なページだけを読み込む.
+    """
+
+    if TYPE_CHECKING:
+        # ページの内容は文字列のみで, 読み込む前は空文字列になっている.
+        pages: list[str]
+        _loader: Callable[[int], Awaitable[str]]
+        _loaded: set[int]
+
+    def __init__(self, page_count: int, loader: Callable[[int], Awaitable[str]], **kwargs: Any) -> None:
+        """
+        Parameters
+        ----------
+        page_count : int
+            ページの数.
+        loader : Callable[[int], Awaitable[str]]
+            ページ番号 (0から始まる) を受け取り, ページの内容を返す関数. 同じページは1度だけ呼ばれる.
+        **kwargs : Any
+            SimplifiedPaginatorに渡す引数.
+        """
+        self._loader = loader
+        self._loaded = set()
+        super().__init__(pages=[""] * page_count, **kwargs)
+
+    async def load_page(self, page_number: int) -> None:
+        """ページの内容を読み込む. 読み込み済みの場合は何もしない."""
+        if page_number in self._loaded:
+            return
+
+        self.pages[page_number] = await self._loader(page_number)
+        self._loaded.add(page_number)
+
+    async def goto_page(self, page_number: int = 0, *, interaction: Interaction | None = None) -> None:
+        await self.load_page(page_number)
+        await super().goto_page(page_number, interaction=interaction)
+
+    async def respond(self, interaction: Any, *args: Any, **kwargs: Any) -> Message | WebhookMessage:
+        await self.load_page(self.current_page)
+        return await super().respond(interaction, *args, **kwargs)
+
+    async def send(self, ctx: commands.Context, *args: Any, **kwargs: Any) -> Message:
+        await self.load_page(self.current_page)
+        return await super().send(ctx, *args, **kwargs)
+
+
 class EmbedPaginator(commands.Paginator):
 
     def __init__(self, prefix: str = "", suffix: str = "") -> None:
@@ -105,3 +156,36 @@ class EmbedPaginator(commands.Paginator):
             )
             embeds.append(embed)
         return embeds
+
+
+def format_percentile(
+    lc: ILoungeClient,
+    mmr: int | float,
+    season: Season | None = None,
+    attribute: Literal["mmr", "max_mmr"] = "mmr",
+) -> str:
+    """MMRがリーダーボードの上位何%かを表す文字列を返す. スナップショットが無い場合は空文字列を返す.
+
+    Parameters
+    ----------
+    lc : ILoungeClient
+        スナップショットを持つクライアント.
+    mmr : int | float
+        MMR.
+    season : Season | None, optional
+        シーズン, by default None
+    attribute : Literal["mmr", "max_mmr"], optional
+        比較する項目, by default "mmr"
+
+    Returns
+    -------
+    str
+        ` (Top 12.3%)`のような文字列.
+    """
+    snapshot = lc.get_leaderboard_snapshot(season)
+
+    if snapshot is None:
+        return ""
+
+    percentile = snapshot.percentile(mmr, attribute)
+    return f" (Top {percentile:.1f}%)" if percentile is not None else ""
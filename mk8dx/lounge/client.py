@@ -1,29 +1,137 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, ClassVar, Final, Literal, TypeVar
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, ClassVar, Final, Hashable, Literal, Sequence, TypeVar
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
+from utils.cache import CacheStats, TTLCache
 from utils.constants import CURRENT_SEASON
 
 from .leaderboard import LeaderBoard
 from .player import Player, PlayerDetails
+from .ratelimit import MAX_RETRY_AFTER, RateLimitConfig, RateLimiter, get_backoff, parse_retry_after
+from .snapshot import LeaderBoardSnapshot
+from .store import decode_player_details, encode_player_details
 from .types.client import LoungeClient as ILoungeClient, SortBy
-from .utils import BaseModel, Search
+from .utils import BaseModel, Search, normalize_name
 
 __all__ = ("LoungeClient",)
 
 GetPlayerParams = Literal["id", "name", "mkcId", "discordId", "fc"]
 GetPlayerDetailsParams = Literal["id", "name"]
 
+# (検索に使うパラメータ, パラメータの値, シーズン)
+PlayerCacheKey = tuple[GetPlayerParams, str, str]
+PlayerDetailsCacheKey = tuple[GetPlayerDetailsParams, str, str]
+
 T = TypeVar("T", bound=BaseModel)
+RT = TypeVar("RT")
 
 if TYPE_CHECKING:
+    from repository.types import PlayerDetailsRepository
     from utils.constants import Season
 
+    from .player import LeaderBoardPlayer
+
 logger = logging.getLogger(__name__)
 
+# コネクションプールの設定. Lounge APIへの接続はTCP+TLSのハンドシェイクを使い回すために1つのセッションで行う.
+CONNECTION_LIMIT: Final[int] = 64
+CONNECTION_LIMIT_PER_HOST: Final[int] = 32
+KEEPALIVE_TIMEOUT: Final[float] = 30.0
+DNS_CACHE_TTL: Final[int] = 300
+REQUEST_TIMEOUT: Final[float] = 10.0
+
+# エンドポイントごとのレートリミット. 上限を超えたリクエストはキューで待たせる.
+DEFAULT_RATE_LIMIT: Final[RateLimitConfig] = RateLimitConfig(rate=5, burst=10, max_concurrency=4)
+RATE_LIMITS: Final[dict[str, RateLimitConfig]] = {
+    "player": RateLimitConfig(rate=10, burst=20, max_concurrency=8),
+    "player/details": RateLimitConfig(rate=5, burst=10, max_concurrency=4),
+    "leaderboard": RateLimitConfig(rate=2, burst=4, max_concurrency=2),
+}
+# 429 Too Many Requestsなどが返ってきた場合に再試行する回数.
+MAX_RETRIES: Final[int] = 3
+RETRYABLE_STATUSES: Final[frozenset[int]] = frozenset({429, 503})
+
+# キャッシュの設定. PlayerDetailsはmmrChangesを含み1件あたりのサイズが大きいため, 保持する数を少なくしている.
+# Playerは1人あたり最大5つのキー (id, mkcId, discordId, fc, name) で登録されるため, その分多めに確保している.
+PLAYER_CACHE_SIZE: Final[int] = 50000
+PLAYER_DETAILS_CACHE_SIZE: Final[int] = 500
+# 現在のシーズンのデータはMMRが変動するため短めに, 過去のシーズンのデータは変更されないため長めに保持する.
+CURRENT_SEASON_CACHE_TTL: Final[float] = 10 * 60
+PAST_SEASON_CACHE_TTL: Final[float] = 24 * 60 * 60
+# stale_while_revalidateを指定した場合に, 有効期限が切れたPlayerDetailsを返す最大の経過時間.
+# これより古いものは返さずにAPIから取得し直す.
+PLAYER_DETAILS_MAX_STALENESS: Final[float] = 60 * 60
+# 識別子 (discord IDなど) とプレイヤーの対応はほとんど変わらないため, MMRなどとは別に長期間保持する.
+IDENTITY_CACHE_SIZE: Final[int] = 100000
+IDENTITY_CACHE_TTL: Final[float] = 7 * 24 * 60 * 60
+
+# リーダーボードのスナップショットの設定.
+# 現在のシーズンは定期的に作り直し, それ以外のシーズンは一括取得で必要になった時に作成する.
+# 取得するプレイヤーがBULK_THRESHOLD人以上でスナップショットが無い場合に, バックグラウンドで作成する.
+BULK_THRESHOLD: Final[int] = 10
+LEADERBOARD_PAGE_SIZE: Final[int] = 100
+MAX_SEASONS_CACHED: Final[int] = 3
+# 1回の作成で総人数 / LEADERBOARD_PAGE_SIZE回リクエストする. (5万人で500回, leaderboardのレートリミットで約4分)
+SNAPSHOT_REFRESH_INTERVAL: Final[float] = 15 * 60
+
+
+def get_snapshot_ttl(season: int | str) -> float:
+    """シーズンに応じたリーダーボードのスナップショットの有効期限を返す.
+    現在のシーズンは更新に失敗した場合でも次の更新まで使えるよう, 更新間隔の2倍にしている.
+    """
+    return PAST_SEASON_CACHE_TTL if int(season) < CURRENT_SEASON else SNAPSHOT_REFRESH_INTERVAL * 2
+
+
+def get_cache_ttl(season: int | str) -> float:
+    """シーズンに応じたキャッシュの有効期限を返す.
+
+    Parameters
+    ----------
+    season : int | str
+        シーズン.
+
+    Returns
+    -------
+    float
+        有効期限 (秒).
+    """
+    return PAST_SEASON_CACHE_TTL if int(season) < CURRENT_SEASON else CURRENT_SEASON_CACHE_TTL
+
+
+def create_session() -> ClientSession:
+    """Lounge API用のコネクションプールを持つセッションを作成する.
+    イベントループが起動している状態で呼び出す必要がある.
+
+    Returns
+    -------
+    ClientSession
+        作成したセッション.
+    """
+    connector = TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+    )
+    return ClientSession(connector=connector, timeout=ClientTimeout(total=REQUEST_TIMEOUT))
+
+
+class RequestFailed(Exception):
+    """再試行しても取得できなかった場合など, プレイヤーが存在しないのではなくリクエストが失敗した場合のエラー.
+    見つからなかった (404) 場合と異なり, 結果をキャッシュしない.
+    """
+
+    def __init__(self, path: str, status: int) -> None:
+        self.path = path
+        self.status = status
+        super().__init__(f"GET {path} failed (status:{status})")
+
 
 class LoungeClient(ILoungeClient):
     GET_PLAYER_PARAMS: ClassVar[tuple[GetPlayerParams, ...]] = (
@@ -40,22 +148,276 @@ class LoungeClient(ILoungeClient):
     API_URL: Final[str] = "https://www.mk8dx-lounge.com/api/"
 
     if TYPE_CHECKING:
-        _players_cache: dict[GetPlayerParams, dict[str, Player | None]]
-        _player_details_cache: dict[GetPlayerDetailsParams, dict[str, PlayerDetails | None]]
+        api_url: str
+        _session: ClientSession | None
+        _owns_session: bool
+        _players_cache: TTLCache[PlayerCacheKey, Player | None]
+        _player_details_cache: TTLCache[PlayerDetailsCacheKey, PlayerDetails | None]
+        _inflight: dict[Hashable, asyncio.Future]
+        _rate_limits: dict[str, RateLimitConfig]
+        _limiters: dict[str, RateLimiter]
+        _identities: TTLCache[tuple[GetPlayerParams, str], Player]
+        _leaderboards: TTLCache[str, LeaderBoardSnapshot]
+        _background_tasks: set[asyncio.Task]
+        _snapshot_interval: float | None
+        _snapshot_task: asyncio.Task | None
+        _store: PlayerDetailsRepository | None
+
+    def __init__(
+        self,
+        session: ClientSession | None = None,
+        api_url: str | None = None,
+        rate_limits: dict[str, RateLimitConfig] | None = None,
+        snapshot_interval: float | None = SNAPSHOT_REFRESH_INTERVAL,
+    ) -> None:
+        """Lounge APIのクライアントを初期化する.
 
-    def __init__(self) -> None:
+        Parameters
+        ----------
+        session : ClientSession | None, optional
+            リクエストに使うセッション, by default None.
+            指定した場合はそのセッションを使い, クライアント側ではcloseしない. (テスト用のサーバーに向ける場合など)
+            指定しない場合はLoungeClient.setup()でコネクションプールを持つセッションを作成する.
+        api_url : str | None, optional
+            APIのベースURL, by default None. Noneの場合はLoungeClient.API_URL.
+        rate_limits : dict[str, RateLimitConfig] | None, optional
+            エンドポイント (playerなど) ごとのレートリミット, by default None.
+            指定したエンドポイントのみRATE_LIMITSを上書きする.
+        snapshot_interval : float | None, optional
+            現在のシーズンのリーダーボードのスナップショットを作り直す間隔 (秒), by default SNAPSHOT_REFRESH_INTERVAL.
+            Noneの場合は定期的な更新を行わない.
+        """
+        self.api_url = api_url or self.API_URL
+        self._session = session
+        self._owns_session = session is None
+        self._inflight = {}
+        self._rate_limits = {**RATE_LIMITS, **(rate_limits or {})}
+        self._limiters = {}
+        self._background_tasks = set()
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_task = None
+        self._store = None
         self._clear_cache()
 
+    async def setup(self) -> None:
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+            self._owns_session = True
+
+        if self._snapshot_interval is not None and self._snapshot_task is None:
+            self._snapshot_task = asyncio.ensure_future(self._refresh_snapshot_periodically(self._snapshot_interval))
+
+    async def close(self) -> None:
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+
+        for task in self._background_tasks:
+            task.cancel()
+
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
+    def set_store(self, store: PlayerDetailsRepository | None) -> None:
+        self._store = store
+
     def _clear_cache(self) -> None:
-        self._players_cache = {query: {} for query in self.GET_PLAYER_PARAMS}
-        self._player_details_cache = {query: {} for query in self.GET_PLAYER_DETAILS_PARAMS}
+        self._players_cache = TTLCache(maxsize=PLAYER_CACHE_SIZE, ttl=CURRENT_SEASON_CACHE_TTL)
+        self._player_details_cache = TTLCache(maxsize=PLAYER_DETAILS_CACHE_SIZE, ttl=CURRENT_SEASON_CACHE_TTL)
+        self._identities = TTLCache(maxsize=IDENTITY_CACHE_SIZE, ttl=IDENTITY_CACHE_TTL)
+        self._leaderboards = TTLCache(maxsize=MAX_SEASONS_CACHED, ttl=CURRENT_SEASON_CACHE_TTL)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return {
+            "players": self._players_cache.stats,
+            "player_details": self._player_details_cache.stats,
+            "identities": self._identities.stats,
+            "leaderboards": self._leaderboards.stats,
+        }
+
+    def _run_in_background(self, coro: Awaitable[RT]) -> None:
+        task = asyncio.ensure_future(coro)
+        # タスクがGCで破棄されないように参照を保持する.
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _coalesce(self, key: Hashable, factory: Callable[[], Awaitable[RT]]) -> RT:
+        """同じキーのリクエストが実行中の場合は新たにリクエストせず, 実行中のリクエストの結果を待つ.
+
+        Parameters
+        ----------
+        key : Hashable
+            リクエストを識別するキー.
+        factory : Callable[[], Awaitable[RT]]
+            実行中のリクエストが無い場合に呼び出される関数.
+
+        Returns
+        -------
+        RT
+            リクエストの結果.
+        """
+        try:
+            future = self._inflight[key]
+        except KeyError:
+            future = self._inflight[key] = asyncio.ensure_future(factory())
+
+            def on_done(f: asyncio.Future) -> None:
+                if self._inflight.get(key) is f:
+                    del self._inflight[key]
+                # 待っている呼び出し元が全てキャンセルされた場合でも, 例外が未処理として警告されないようにする.
+                if not f.cancelled():
+                    f.exception()
+
+            future.add_done_callback(on_done)
+
+        # 1つの呼び出し元がキャンセルされても, 同じリクエストを待っている他の呼び出し元には影響させない.
+        return await asyncio.shield(future)
+
+    def _cache_player(self, key: PlayerCacheKey, player: Player | None) -> None:
+        """プレイヤーをキャッシュする.
+        プレイヤーが見つかった場合は, 別のパラメータで検索された際にもキャッシュを使えるよう,
+        プレイヤーが持つ全ての識別子をキーとして登録する.
+
+        Parameters
+        ----------
+        key : PlayerCacheKey
+            検索に使われたキー.
+        player : Player | None
+            検索結果.
+        """
+        season = key[2]
+        ttl = get_cache_ttl(season)
+        self._players_cache.set(key, player, ttl=ttl)
+
+        if player is None:
+            return
+
+        identifiers: list[tuple[GetPlayerParams, str | None]] = [
+            ("id", str(player.id)),
+            ("mkcId", str(player.mkc_id)),
+            ("discordId", player.discord_id),
+            ("fc", player.switch_fc),
+            ("name", normalize_name(player.name)),
+        ]
+
+        for query, value in identifiers:
+            if value is not None:
+                self._players_cache.set((query, value, season), player, ttl=ttl)
+                self._identities[(query, value)] = player
+
+    def _get_player_from_snapshot(self, key: PlayerCacheKey) -> Player | None:
+        """リーダーボードのスナップショットからプレイヤーを作成する.
+        リーダーボードにはmkcIdやdiscord ID, フレンドコードが含まれないため, それらは以前に取得したプレイヤーの情報を使う.
+        IDや名前で検索された場合は, 先にスナップショットの索引で探し, リーダーボードに居ないプレイヤーは識別情報を探さない.
+
+        Parameters
+        ----------
+        key : PlayerCacheKey
+            検索に使われたキー.
+
+        Returns
+        -------
+        Player | None
+            作成したプレイヤー. スナップショットが無い場合や, 作成できなかった場合はNone.
+        """
+        query, value, season = key
+        snapshot = self._leaderboards.get(season)
+
+        if snapshot is None:
+            return None
+
+        identity: Player | None = None
+        row: LeaderBoardPlayer | None = None
+
+        if query == "name":
+            row = snapshot.find(value)
+        elif query == "id":
+            row = snapshot.get(int(value)) if value.isdecimal() else None
+        elif (identity := self._identities.get((query, value))) is not None:
+            row = snapshot.get(identity.id)
+
+        if row is None:
+            return None
+
+        if identity is None:
+            # 名前は変更されることがあるため, 変わらないIDで識別情報を探す.
+            identity = self._identities.get(("id", str(row.id)))
+
+        return merge_leaderboard_player(identity, row) if identity is not None else None
+
+    def _cache_player_details(self, key: PlayerDetailsCacheKey, details: PlayerDetails | None) -> None:
+        """プレイヤー詳細情報をキャッシュする. `LoungeClient._cache_player`と同様に, id, nameの両方で登録する.
+
+        Parameters
+        ----------
+        key : PlayerDetailsCacheKey
+            検索に使われたキー.
+        details : PlayerDetails | None
+            検索結果.
+        """
+        season = key[2]
+        ttl = get_cache_ttl(season)
+        self._player_details_cache.set(key, details, ttl=ttl)
+
+        if details is None:
+            return
+
+        self._player_details_cache.set(("id", str(details.player_id), season), details, ttl=ttl)
+        self._player_details_cache.set(("name", normalize_name(details.name), season), details, ttl=ttl)
+
+    def _get_limiter(self, path: str) -> RateLimiter:
+        try:
+            return self._limiters[path]
+        except KeyError:
+            limiter = self._limiters[path] = RateLimiter(self._rate_limits.get(path, DEFAULT_RATE_LIMIT))
+            return limiter
 
     async def __get(self, path: str, params: dict, cls: type[T]) -> T | None:
-        async with ClientSession() as session:
-            async with session.get(f"{self.API_URL}{path}", params=params) as response:
-                if response.status != 200:
-                    return None
-                return cls(await response.json())
+        if self._session is None or self._session.closed:
+            # setup()より前に呼ばれた場合でも動作するように遅延して作成する.
+            await self.setup()
+
+        session: ClientSession = self._session  # type: ignore # setup()で作成済み
+        limiter = self._get_limiter(path)
+
+        for attempt in range(MAX_RETRIES + 1):
+            async with limiter:
+                started_at = time.perf_counter()
+
+                async with session.get(f"{self.api_url}{path}", params=params) as response:
+                    logger.debug(
+                        f"GET {path} status:{response.status} elapsed:{(time.perf_counter() - started_at) * 1000:.1f}ms"
+                    )
+
+                    if response.status == 200:
+                        return cls(await response.json())
+
+                    # 見つからなかった場合のみNoneを返し, 呼び出し元でキャッシュさせる.
+                    if response.status == 404:
+                        return None
+
+                    if response.status not in RETRYABLE_STATUSES:
+                        raise RequestFailed(path, response.status)
+
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt == MAX_RETRIES:
+                break
+
+            # 長すぎるRetry-Afterに従うとエンドポイント全体が止まるため, このリクエストだけを失敗させる.
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                logger.warning(f"GET {path} returned Retry-After {retry_after:.0f}s, which exceeds {MAX_RETRY_AFTER:.0f}s")
+                raise RequestFailed(path, response.status)
+
+            # 同時に待っているリクエストが一斉に再送されないよう, Retry-Afterにもジッターを加える.
+            delay = get_backoff(attempt) if retry_after is None else retry_after + get_backoff(0)
+            logger.warning(f"GET {path} was rate limited (status:{response.status}). Retrying in {delay:.2f}s")
+            # サーバーから制限されている間は, 同じエンドポイントへの他のリクエストも止める.
+            limiter.pause(delay)
+
+        logger.warning(f"GET {path} failed after {MAX_RETRIES} retries")
+        raise RequestFailed(path, response.status)
 
     async def get_player(
         self,
@@ -95,21 +457,44 @@ class LoungeClient(ILoungeClient):
         else:
             return None
 
-        identifier = f"{params[query]}-season:{params['season']}"
+        # 名前は表記揺れがあっても同じプレイヤーを指すため, 正規化したものをキーにする.
+        value = normalize_name(params[query]) if query == "name" else params[query]
+        key: PlayerCacheKey = (query, value, params["season"])
         try:
-            return self._players_cache[query][identifier]
+            return self._players_cache[key]
         except KeyError:
-            logger.debug(f"Player query:{query}, id:{identifier} not found in cache")
-            player = await self.__get("player", params, Player)
-            self._players_cache[query][identifier] = player
+            logger.debug(f"Player query:{query}, id:{value}-season:{params['season']} not found in cache")
 
+        if (player := self._get_player_from_snapshot(key)) is not None:
+            self._cache_player(key, player)
             return player
 
+        return await self._fetch_player(key, params)
+
+    async def _fetch_player(
+        self,
+        key: PlayerCacheKey,
+        params: dict[GetPlayerParams | Literal["season"], str],
+    ) -> Player | None:
+        """キャッシュやスナップショットを確認せずに, APIからプレイヤー情報を取得してキャッシュする."""
+
+        async def fetch() -> Player | None:
+            player = await self.__get("player", params, Player)
+            self._cache_player(key, player)
+            return player
+
+        try:
+            return await self._coalesce(("player", *key), fetch)
+        except RequestFailed:
+            # 一時的な失敗で存在しないプレイヤーとしてキャッシュしないよう, キャッシュせずにNoneを返す.
+            return None
+
     async def get_player_details(
         self,
         player_id: int | str | None = None,
         name: str | None = None,
         season: Season | None = None,
+        stale_while_revalidate: bool = False,
     ) -> PlayerDetails | None:
         params: dict[GetPlayerDetailsParams | Literal["season"], str] = {
             "season": str(season) if season is not None else str(CURRENT_SEASON)
@@ -125,16 +510,215 @@ class LoungeClient(ILoungeClient):
         else:
             return None
 
-        identifier = f"{params[query]}-season:{params['season']}"
+        value = normalize_name(params[query]) if query == "name" else params[query]
+        key: PlayerDetailsCacheKey = (query, value, params["season"])
+
+        # 過去のシーズンの情報は変わらないため, 永続化したものがあればAPIに問い合わせずに使う.
+        persistent = self._store is not None and int(params["season"]) < CURRENT_SEASON
+        inflight_key = ("player/details", *key)
+
+        async def fetch() -> PlayerDetails | None:
+            if persistent:
+                details = await self._load_player_details(key)
+
+                if details is not None:
+                    self._cache_player_details(key, details)
+                    return details
+
+            details = await self.__get("player/details", params, PlayerDetails)
+            self._cache_player_details(key, details)
+
+            if persistent and details is not None:
+                self._run_in_background(self._save_player_details(details))
+
+            return details
 
         try:
-            return self._player_details_cache[query][identifier]
+            if not stale_while_revalidate:
+                return self._player_details_cache[key]
+
+            details, expired = self._player_details_cache.get_stale(key, PLAYER_DETAILS_MAX_STALENESS)
+
+            # 有効期限が切れている場合は古いものをそのまま返し, 裏で取得し直してキャッシュを更新する.
+            if expired and inflight_key not in self._inflight:
+                self._run_in_background(self._revalidate(inflight_key, fetch))
+
+            return details
         except KeyError:
-            logger.debug(f"PlayerDetails query:{query}, id:{identifier} not found in cache")
-            player = await self.__get("player/details", params, PlayerDetails)
-            self._player_details_cache[query][identifier] = player
+            logger.debug(f"PlayerDetails query:{query}, id:{value}-season:{params['season']} not found in cache")
 
-            return player
+        try:
+            return await self._coalesce(inflight_key, fetch)
+        except RequestFailed:
+            return None
+
+    async def _revalidate(self, key: Hashable, factory: Callable[[], Awaitable[RT]]) -> None:
+        """stale_while_revalidateで返したキャッシュを裏で更新する. 失敗した場合は次の呼び出しで再度更新する."""
+        try:
+            await self._coalesce(key, factory)
+        except Exception as e:
+            logger.warning(f"Failed to revalidate {key}: {e!r}")
+
+    async def _load_player_details(self, key: PlayerDetailsCacheKey) -> PlayerDetails | None:
+        """永続化されたプレイヤー詳細情報を取得する. 取得に失敗した場合はNoneを返し, APIへの問い合わせに任せる."""
+        query, value, season = key
+
+        if query == "id":
+            player_id = value
+        else:
+            # 名前で検索された場合は, 過去に取得したプレイヤーからIDが分かる場合のみ使う.
+            identity = self._identities.get(("name", value))
+
+            if identity is None:
+                return None
+
+            player_id = str(identity.id)
+
+        if self._store is None or not player_id.isdecimal():
+            return None
+
+        try:
+            data = await self._store.get_player_details_cache(int(player_id), int(season))
+
+            if data is None:
+                return None
+
+            return decode_player_details(data)
+        except Exception as e:
+            logger.warning(f"Failed to load PlayerDetails id:{player_id}-season:{season} from store: {e!r}")
+            return None
+
+    async def _save_player_details(self, details: PlayerDetails) -> None:
+        if self._store is None:
+            return
+
+        try:
+            await self._store.put_player_details_cache(details.player_id, details.season, encode_player_details(details))
+        except Exception as e:
+            logger.warning(f"Failed to save PlayerDetails id:{details.player_id}-season:{details.season} to store: {e!r}")
+
+    async def get_players_by_discord_ids(
+        self,
+        discord_ids: Sequence[int | str],
+        season: Season | None = None,
+    ) -> list[Player | None]:
+        _season = str(season) if season is not None else str(CURRENT_SEASON)
+        players: dict[str, Player | None] = {}
+        misses: list[str] = []
+
+        for discord_id in dict.fromkeys(str(d) for d in discord_ids):
+            try:
+                players[discord_id] = self._players_cache[("discordId", discord_id, _season)]
+            except KeyError:
+                misses.append(discord_id)
+
+        if misses:
+            misses = self._resolve_from_leaderboard(misses, _season, players)
+
+        # キャッシュとスナップショットは確認済みのため, 直接APIから取得する.
+        fetched = await asyncio.gather(
+            *[self._fetch_player(("discordId", d, _season), {"discordId": d, "season": _season}) for d in misses]
+        )
+        players.update(zip(misses, fetched))
+
+        return [players[str(d)] for d in discord_ids]
+
+    def _resolve_from_leaderboard(self, discord_ids: list[str], season: str, players: dict[str, Player | None]) -> list[str]:
+        """リーダーボードのスナップショットからプレイヤー情報を解決する.
+        スナップショットがまだ無く, 解決するプレイヤーがBULK_THRESHOLD人以上の場合はバックグラウンドで作成する.
+
+        Parameters
+        ----------
+        discord_ids : list[str]
+            解決するプレイヤーのdiscord ID.
+        season : str
+            シーズン.
+        players : dict[str, Player | None]
+            解決したプレイヤーを格納するdict.
+
+        Returns
+        -------
+        list[str]
+            解決できなかったdiscord ID.
+        """
+        if season not in self._leaderboards:
+            if len(discord_ids) >= BULK_THRESHOLD:
+                self._run_in_background(self._coalesce(("leaderboard", season), lambda: self._load_leaderboard(season)))
+            return discord_ids
+
+        unresolved: list[str] = []
+
+        for discord_id in discord_ids:
+            key: PlayerCacheKey = ("discordId", discord_id, season)
+            player = self._get_player_from_snapshot(key)
+
+            if player is None:
+                unresolved.append(discord_id)
+                continue
+
+            self._cache_player(key, player)
+            players[discord_id] = player
+
+        logger.debug(
+            f"Resolved {len(discord_ids) - len(unresolved)}/{len(discord_ids)} players from leaderboard (season:{season})"
+        )
+        return unresolved
+
+    async def _load_leaderboard(self, season: str) -> LeaderBoardSnapshot | None:
+        """リーダーボードを全ページ取得してスナップショットを作成し, キャッシュする.
+        取得に失敗したページがある場合は, 既存のスナップショットをそのまま使い続ける.
+
+        Parameters
+        ----------
+        season : str
+            シーズン.
+
+        Returns
+        -------
+        LeaderBoardSnapshot | None
+            作成したスナップショット. 全てのページを取得できなかった場合はNone.
+        """
+        _season: Season = int(season)  # type: ignore
+        first = await self.get_leaderboard(season=_season, page_size=LEADERBOARD_PAGE_SIZE)
+        pages = await asyncio.gather(
+            *[
+                self.get_leaderboard(season=_season, skip=skip, page_size=LEADERBOARD_PAGE_SIZE)
+                for skip in range(LEADERBOARD_PAGE_SIZE, first.total_players, LEADERBOARD_PAGE_SIZE)
+            ]
+        )
+
+        # get_leaderboardは取得に失敗すると空のリーダーボードを返す. 総人数の範囲内のページが空になることは無いため, 失敗とみなす.
+        failed = sum(page.is_empty for page in (first, *pages))
+
+        if failed > 0:
+            logger.warning(
+                f"Failed to load {failed}/{len(pages) + 1} leaderboard pages (season:{season}). Keeping the previous snapshot"
+            )
+            return None
+
+        rows: list[LeaderBoardPlayer] = [row for page in (first, *pages) for row in page]
+        snapshot = LeaderBoardSnapshot(season=_season, players=rows, total_players=first.total_players)
+        # 全てのページを取得してから入れ替えるため, 作成中や失敗時に一部のページだけのスナップショットが使われることは無い.
+        self._leaderboards.set(season, snapshot, ttl=get_snapshot_ttl(season))
+
+        logger.info(f"Loaded leaderboard snapshot (season:{season}, players:{len(snapshot)}/{snapshot.total_players})")
+        return snapshot
+
+    async def _refresh_snapshot_periodically(self, interval: float) -> None:
+        season = str(CURRENT_SEASON)
+
+        while True:
+            try:
+                await self._coalesce(("leaderboard", season), lambda: self._load_leaderboard(season))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to refresh leaderboard snapshot")
+
+            await asyncio.sleep(interval)
+
+    def get_leaderboard_snapshot(self, season: Season | None = None) -> LeaderBoardSnapshot | None:
+        return self._leaderboards.get(str(season) if season is not None else str(CURRENT_SEASON))
 
     async def get_leaderboard(
         self,
@@ -169,8 +753,36 @@ class LoungeClient(ILoungeClient):
         if max_events_played is not None:
             params["maxEventsPlayed"] = str(max_events_played)
 
-        data = await self.__get("leaderboard", params, LeaderBoard)
+        try:
+            data = await self.__get("leaderboard", params, LeaderBoard)
+        except RequestFailed:
+            data = None
 
         if data is None:
             return LeaderBoard({"totalPlayers": 0, "data": []})
         return data
+
+
+def merge_leaderboard_player(identity: Player, row: LeaderBoardPlayer) -> Player:
+    """以前に取得したプレイヤーの識別情報と, リーダーボードのMMRなどを組み合わせたプレイヤーを作成する.
+
+    Parameters
+    ----------
+    identity : Player
+        以前に取得したプレイヤー. id, mkcId, discordIdなどの変わらない情報のみを使う.
+    row : LeaderBoardPlayer
+        リーダーボードのプレイヤー.
+
+    Returns
+    -------
+    Player
+        作成したプレイヤー.
+    """
+    data = identity.to_dict()
+    data["name"] = row.name
+    data["mmr"] = row.mmr
+    data["maxMmr"] = row.max_mmr
+    # リーダーボードに載っているプレイヤーは非公開ではない.
+    data["isHidden"] = False
+    data["linkedId"] = None
+    return Player(data)
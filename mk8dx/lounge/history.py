@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import timezone
+from typing import TYPE_CHECKING, Final
+
+import numpy as np
+
+from .utils import parse_datetime
+
+__all__ = ("MmrHistory",)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .types.player import MmrChange as MmrChangePayload, ReasonType
+
+
+# changeIdが無い場合の値. Lounge APIのIDは正の整数のため重複しない.
+NO_CHANGE_ID: Final[int] = -1
+# グラフに表示するMMRの変動の種類.
+TABLE_REASONS: Final[tuple[ReasonType, ...]] = ("Table", "Placement")
+
+
+class MmrHistory:
+    """プレイヤーのMMRの変動履歴を列ごとの配列として保持する.
+    PlayerDetails.mmr_changesをMmrChangeに変換せずに集計するために使う.
+    全ての配列は古いものから順に並ぶ.
+    """
+
+    __slots__ = (
+        "change_ids",
+        "reasons",
+        "deltas",
+        "new_mmrs",
+        "_times",
+        "_raw_times",
+    )
+
+    if TYPE_CHECKING:
+        change_ids: NDArray[np.int64]
+        reasons: NDArray[np.str_]
+        deltas: NDArray[np.int64]
+        new_mmrs: NDArray[np.int64]
+        _times: NDArray[np.datetime64] | None
+        _raw_times: list[str]
+
+    def __init__(self, changes: list[MmrChangePayload]) -> None:
+        """MMRの変動履歴を作成する.
+
+        Parameters
+        ----------
+        changes : list[MmrChangePayload]
+            Lounge APIが返すmmrChanges. 新しいものから順に並んでいる.
+        """
+        # APIは新しいものから順に返すため, 逆順にして古いものから並べる.
+        changes = changes[::-1]
+
+        self.change_ids = np.array(
+            [c["changeId"] if c.get("changeId") is not None else NO_CHANGE_ID for c in changes],
+            dtype=np.int64,
+        )
+        self.reasons = np.array([c["reason"] for c in changes], dtype=np.str_)
+        self.deltas = np.array([c["mmrDelta"] for c in changes], dtype=np.int64)
+        self.new_mmrs = np.array([c["newMmr"] for c in changes], dtype=np.int64)
+        self._times = None
+        self._raw_times = [c["time"] for c in changes]
+
+    def __len__(self) -> int:
+        return len(self.change_ids)
+
+    @property
+    def times(self) -> NDArray[np.datetime64]:
+        """MMRが変動した日時 (UTC). 初めて参照されたときに変換される."""
+        if self._times is None:
+            self._times = to_datetime_array(self._raw_times)
+
+        return self._times
+
+    @property
+    def deleted(self) -> NDArray[np.bool_]:
+        """TableDeleteにより取り消された変動かどうか."""
+        deleted_ids = self.change_ids[(self.reasons == "TableDelete") & (self.change_ids != NO_CHANGE_ID)]
+        return np.isin(self.change_ids, deleted_ids) & (self.change_ids != NO_CHANGE_ID)
+
+    def table_mask(self) -> NDArray[np.bool_]:
+        """取り消されていない模擬 (Table) と初期MMR (Placement) の変動かどうか."""
+        return np.isin(self.reasons, TABLE_REASONS) & ~self.deleted
+
+    def mmr_series(self) -> NDArray[np.int64]:
+        """グラフに表示するMMRの推移を返す.
+
+        Returns
+        -------
+        NDArray[np.int64]
+            取り消されていない模擬と初期MMRの変動後のMMR. 古いものから順に並ぶ.
+        """
+        return self.new_mmrs[self.table_mask()]
+
+
+def to_datetime_array(values: list[str]) -> NDArray[np.datetime64]:
+    """ISO 8601形式の日時のリストをUTCのdatetime64の配列に変換する."""
+    # Lounge APIの日時は基本的にUTC (末尾がZ) のため, タイムゾーンを外してまとめて変換する.
+    if all(v.endswith("Z") for v in values):
+        return np.array([v[:-1] for v in values], dtype="datetime64[ms]")
+
+    times = [parse_datetime(v) for v in values]
+    return np.array(
+        [t.astimezone(timezone.utc).replace(tzinfo=None) if t.tzinfo is not None else t for t in times],
+        dtype="datetime64[ms]",
+    )
@@ -2,16 +2,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Final, TypedDict, TypeVar
 
-from dateutil.parser import isoparse  # type: ignore
 from discord import Embed, File
 
 from figure.stats import create_mmr_history_graph
 
 from .errors import NoMMRFound
+from .history import MmrHistory
 from .rank import Rank
-from .utils import BaseModel
+from .utils import BaseModel, parse_datetime
 
 if TYPE_CHECKING:
+    from figure.types import FigureRenderer
+
     from .types.player import BasePlayer as BasePlayerPayload, Player as PlayerPayload, PlayerDetails as PlayerDetailsPayload
 
     class Stats(TypedDict):
@@ -85,7 +87,7 @@ class MmrChange(BaseModel):
         self.new_mmr = data["newMmr"]
         self.mmr_delta = data["mmrDelta"]
         self.reason = data["reason"]
-        self.time = isoparse(data["time"])
+        self.time = parse_datetime(data["time"])
         self.score = data.get("score")
         # NOTE: data.get("partnerScores") or [] としているのは、
         # data["partnerScores"]がNoneの場合に空リストを返すため
@@ -119,7 +121,7 @@ class NameChange(BaseModel):
 
     def __init__(self, data: NameChangePayload) -> None:
         self.name = data["name"]
-        self.changed_on = isoparse(data["changedOn"])
+        self.changed_on = parse_datetime(data["changedOn"])
 
     def to_dict(self) -> NameChangePayload:
         return {
@@ -279,9 +281,12 @@ class PlayerDetails(BasePlayer):
         "average_score",
         "average_last_ten",
         "partner_average",
-        "mmr_changes",
-        "name_history",
         "rank",
+        "_mmr_changes_payload",
+        "_name_history_payload",
+        "_mmr_changes",
+        "_name_history",
+        "_mmr_history",
     )
 
     if TYPE_CHECKING:
@@ -308,9 +313,12 @@ class PlayerDetails(BasePlayer):
         average_score: float | None
         average_last_ten: float | None
         partner_average: float | None
-        mmr_changes: list[MmrChange]
-        name_history: list[NameChange]
         rank: Rank
+        _mmr_changes_payload: list[MmrChangePayload]
+        _name_history_payload: list[NameChangePayload]
+        _mmr_changes: list[MmrChange] | None
+        _name_history: list[NameChange] | None
+        _mmr_history: MmrHistory | None
 
     def __init__(self, data: PlayerDetailsPayload) -> None:
         super().__init__(data)
@@ -335,9 +343,37 @@ class PlayerDetails(BasePlayer):
         self.average_score = data.get("averageScore")
         self.average_last_ten = data.get("averageLastTen")
         self.partner_average = data.get("partnerAverage")
-        self.mmr_changes = [MmrChange(x) for x in data["mmrChanges"]]
-        self.name_history = [NameChange(x) for x in data["nameHistory"]]
         self.rank = Rank.from_nick(data["rank"])
+        # mmrChangesは数百件になることがあるため, 参照されるまでMmrChangeに変換しない.
+        self._mmr_changes_payload = data["mmrChanges"]
+        self._name_history_payload = data["nameHistory"]
+        self._mmr_changes = None
+        self._name_history = None
+        self._mmr_history = None
+
+    @property
+    def mmr_changes(self) -> list[MmrChange]:
+        """MMRの変動履歴. 新しいものから順に並ぶ. 初めて参照されたときに変換される."""
+        if self._mmr_changes is None:
+            self._mmr_changes = [MmrChange(x) for x in self._mmr_changes_payload]
+
+        return self._mmr_changes
+
+    @property
+    def name_history(self) -> list[NameChange]:
+        """名前の変更履歴. 新しいものから順に並ぶ. 初めて参照されたときに変換される."""
+        if self._name_history is None:
+            self._name_history = [NameChange(x) for x in self._name_history_payload]
+
+        return self._name_history
+
+    @property
+    def mmr_history(self) -> MmrHistory:
+        """MMRの変動履歴を列ごとの配列にしたもの. MmrChangeを作らずに集計する場合に使う."""
+        if self._mmr_history is None:
+            self._mmr_history = MmrHistory(self._mmr_changes_payload)
+
+        return self._mmr_history
 
     def to_dict(self) -> PlayerDetailsPayload:
         return {
@@ -364,17 +400,20 @@ class PlayerDetails(BasePlayer):
             "averageScore": self.average_score,
             "averageLastTen": self.average_last_ten,
             "partnerAverage": self.partner_average,
-            "mmrChanges": [x.to_dict() for x in self.mmr_changes],
-            "nameHistory": [x.to_dict() for x in self.name_history],
+            # 変換後のオブジェクトは変更されないため, 受け取ったデータをそのまま返す.
+            "mmrChanges": self._mmr_changes_payload,
+            "nameHistory": self._name_history_payload,
             "rank": self.rank.name,
         }
 
-    def to_stats(self, display_name: str | None = None) -> Stats:
+    async def to_stats(self, renderer: FigureRenderer, display_name: str | None = None) -> Stats:
         """プレイヤー情報を表したStatsを返す.
 
 
         Parameters
         ----------
+        renderer : FigureRenderer
+            MMRの推移のグラフを描画するレンダラー.
         display_name : str | None
             表示名. デフォルトはNone.
 
@@ -436,19 +475,12 @@ class PlayerDetails(BasePlayer):
             prev = self.name_history[1]
             e.add_field(name="Previous Name", value=prev.name)
 
-        events = self.mmr_changes[::-1]
-        deleted_ids: list[int] = [e.change_id for e in events if e.reason == "TableDelete" and e.change_id is not None]
-
-        mmr_history: list[int] = []
-
-        for event in events:
-            if event.reason in ("Table", "Placement") and event.change_id not in deleted_ids:
-                mmr_history.append(event.new_mmr)
+        mmr_history = self.mmr_history.mmr_series()
 
         data: Stats = {"embeds": [e], "files": []}
 
         if len(mmr_history) > 2:
-            fp = create_mmr_history_graph(mmr_history, season)
+            fp = await renderer.render(create_mmr_history_graph, mmr_history, season)
             file = File(fp, filename="stats.png")
             data["files"].append(file)
             e.set_image(url="attachment://stats.png")
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+__all__ = (
+    "MAX_RETRY_AFTER",
+    "RateLimitConfig",
+    "RateLimiter",
+    "get_backoff",
+    "parse_retry_after",
+)
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+
+# Retry-Afterに従って待つ時間の上限 (秒). バックオフの上限と同じにし, 不正なヘッダーで長時間止まらないようにする.
+MAX_RETRY_AFTER: Final[float] = 30.0
+
+
+class RateLimitConfig(NamedTuple):
+    # 1秒あたりに補充されるリクエスト数.
+    rate: float
+    # 連続して送信できるリクエストの最大数. (トークンバケットの容量)
+    burst: int
+    # 同時に送信中にできるリクエストの最大数.
+    max_concurrency: int
+
+
+class RateLimiter:
+    """トークンバケットと同時実行数の上限を組み合わせたレートリミッター.
+    上限を超えたリクエストは失敗させずに, 送信できるようになるまで待たせる.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        limiter = RateLimiter(RateLimitConfig(rate=10, burst=20, max_concurrency=8))
+
+        async with limiter:
+            await session.get(...)
+    """
+
+    __slots__ = (
+        "config",
+        "_tokens",
+        "_updated_at",
+        "_blocked_until",
+        "_lock",
+        "_semaphore",
+    )
+
+    if TYPE_CHECKING:
+        config: RateLimitConfig
+        _tokens: float
+        _updated_at: float
+        _blocked_until: float
+        _lock: asyncio.Lock
+        _semaphore: asyncio.Semaphore
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self._tokens = float(config.burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+
+        try:
+            await self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._semaphore.release()
+
+    @property
+    def in_flight(self) -> int:
+        """送信中のリクエストの数."""
+        return self.config.max_concurrency - self._semaphore._value
+
+    def pause(self, delay: float) -> None:
+        """指定した時間, 新たなリクエストの送信を止める. サーバーからRetry-Afterを受け取った場合に使う.
+
+        Parameters
+        ----------
+        delay : float
+            止める時間 (秒). MAX_RETRY_AFTERより長い場合はMAX_RETRY_AFTERだけ止める.
+        """
+        delay = min(delay, MAX_RETRY_AFTER)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    async def _take_token(self) -> None:
+        # 待っている順にトークンを渡すため, ロックを取得してから待つ.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._tokens = min(self.config.burst, self._tokens + (now - self._updated_at) * self.config.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.config.rate)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-Afterヘッダーの値を秒数に変換する.
+
+    Parameters
+    ----------
+    value : str | None
+        Retry-Afterヘッダーの値. 秒数またはHTTP日付.
+
+    Returns
+    -------
+    float | None
+        待つべき秒数. 解釈できない場合はNone.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    # タイムゾーンが-0000や省略されている場合はnaiveなdatetimeになるため, UTCとして扱う.
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def get_backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """ジッター付きの指数バックオフの待ち時間を返す. (Full Jitter)
+
+    Parameters
+    ----------
+    attempt : int
+        何回目の再試行か. 0から始まる.
+    base : float, optional
+        待ち時間の基準値 (秒), by default 0.5
+    cap : float, optional
+        待ち時間の上限 (秒), by default 30.0
+
+    Returns
+    -------
+    float
+        待ち時間 (秒).
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Iterable, Literal
+
+import numpy as np
+
+from utils.utils import drop_duplicates
+
+from .player import LeaderBoardPlayer
+from .utils import normalize_name
+
+__all__ = ("LeaderBoardSnapshot",)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .types.player import LeaderBoardPlayer as LeaderBoardPlayerPayload
+
+    MmrAttribute = Literal["mmr", "max_mmr"]
+
+
+class LeaderBoardSnapshot:
+    """あるシーズンのリーダーボード全体をまとめて保持するスナップショット.
+    リーダーボードを全ページ取得して作成し, 複数のプレイヤーの情報を通信せずに解決するために使う.
+
+    プレイヤーごとにオブジェクトを持つと数万人分のメモリを使うため, 列ごとの配列として保持し,
+    必要になったときにLeaderBoardPlayerを作成する. ID, 名前, MMRでそれぞれ検索できる.
+    """
+
+    __slots__ = (
+        "season",
+        "total_players",
+        "created_at",
+        "_ids",
+        "_names",
+        "_mmrs",
+        "_max_mmrs",
+        "_overall_ranks",
+        "_events_played",
+        "_wins_last_ten",
+        "_losses_last_ten",
+        "_win_rates",
+        "_gain_loss_last_ten",
+        "_country_codes",
+        "_id_order",
+        "_sorted_ids",
+        "_rows_by_name",
+        "_sorted_mmrs",
+        "_sorted_max_mmrs",
+    )
+
+    if TYPE_CHECKING:
+        season: int
+        total_players: int
+        created_at: float
+        _ids: NDArray[np.int64]
+        _names: list[str]
+        # 値が無い場合はNaNになる.
+        _mmrs: NDArray[np.float64]
+        _max_mmrs: NDArray[np.float64]
+        _overall_ranks: NDArray[np.float64]
+        _events_played: NDArray[np.int32]
+        _wins_last_ten: NDArray[np.int32]
+        _losses_last_ten: NDArray[np.int32]
+        _win_rates: NDArray[np.float64]
+        _gain_loss_last_ten: NDArray[np.float64]
+        _country_codes: list[str | None]
+        _id_order: NDArray[np.intp]
+        _sorted_ids: NDArray[np.int64]
+        _rows_by_name: dict[str, int]
+        _sorted_mmrs: NDArray[np.float64]
+        _sorted_max_mmrs: NDArray[np.float64]
+
+    def __init__(self, season: int, players: Iterable[LeaderBoardPlayer], total_players: int) -> None:
+        """スナップショットを作成する.
+
+        Parameters
+        ----------
+        season : int
+            シーズン.
+        players : Iterable[LeaderBoardPlayer]
+            リーダーボードのプレイヤー. 同じIDのプレイヤーが複数ある場合は最初のものを使う.
+        total_players : int
+            APIが返したリーダーボードの総人数. 取得に失敗したページがある場合はlen(snapshot)より大きくなる.
+        """
+        self.season = season
+        self.total_players = total_players
+        self.created_at = time.time()
+
+        # ページの取得中に順位が変動すると, 同じプレイヤーが複数のページに含まれることがある.
+        rows = [p for _, p in drop_duplicates((int(p.id), p) for p in players)]
+
+        self._ids = np.array([p.id for p in rows], dtype=np.int64)
+        self._names = [p.name for p in rows]
+        self._mmrs = to_float_array([p.mmr for p in rows])
+        self._max_mmrs = to_float_array([p.max_mmr for p in rows])
+        self._overall_ranks = to_float_array([p.overall_rank for p in rows])
+        self._events_played = np.array([p.events_played for p in rows], dtype=np.int32)
+        self._wins_last_ten = np.array([p.wins_last_ten for p in rows], dtype=np.int32)
+        self._losses_last_ten = np.array([p.losses_last_ten for p in rows], dtype=np.int32)
+        self._win_rates = to_float_array([p.win_rate for p in rows])
+        self._gain_loss_last_ten = to_float_array([p.gain_loss_last_ten for p in rows])
+        self._country_codes = [p.country_code for p in rows]
+
+        self._id_order = np.argsort(self._ids, kind="stable")
+        self._sorted_ids = self._ids[self._id_order]
+        self._rows_by_name = {}
+
+        for row, name in enumerate(self._names):
+            self._rows_by_name.setdefault(normalize_name(name), row)
+
+        self._sorted_mmrs = np.sort(self._mmrs[~np.isnan(self._mmrs)])
+        self._sorted_max_mmrs = np.sort(self._max_mmrs[~np.isnan(self._max_mmrs)])
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, player_id: object) -> bool:
+        return isinstance(player_id, int) and self._find_row(player_id) is not None
+
+    @property
+    def is_complete(self) -> bool:
+        """全てのページを取得できたかどうか."""
+        return len(self) >= self.total_players
+
+    def get(self, player_id: int) -> LeaderBoardPlayer | None:
+        """プレイヤーIDからリーダーボードのプレイヤーを取得する.
+
+        Parameters
+        ----------
+        player_id : int
+            ラウンジのプレイヤーID.
+
+        Returns
+        -------
+        LeaderBoardPlayer | None
+            プレイヤー. リーダーボードに存在しない場合はNone.
+        """
+        row = self._find_row(player_id)
+        return self._to_player(row) if row is not None else None
+
+    def find(self, name: str) -> LeaderBoardPlayer | None:
+        """プレイヤー名からリーダーボードのプレイヤーを取得する. 空白と大文字小文字は区別しない.
+
+        Parameters
+        ----------
+        name : str
+            プレイヤー名.
+
+        Returns
+        -------
+        LeaderBoardPlayer | None
+            プレイヤー. リーダーボードに存在しない場合はNone.
+        """
+        row = self._rows_by_name.get(normalize_name(name))
+        return self._to_player(row) if row is not None else None
+
+    def percentile(self, mmr: int | float, attribute: MmrAttribute = "mmr") -> float | None:
+        """指定したMMRがリーダーボードの上位何%に位置するかを返す.
+
+        Parameters
+        ----------
+        mmr : int | float
+            MMR.
+        attribute : Literal["mmr", "max_mmr"], optional
+            比較する項目, by default "mmr"
+
+        Returns
+        -------
+        float | None
+            上位何%か (0 < x <= 100). リーダーボードが空の場合はNone.
+        """
+        values = self._sorted_mmrs if attribute == "mmr" else self._sorted_max_mmrs
+
+        if len(values) == 0:
+            return None
+
+        higher = len(values) - int(np.searchsorted(values, mmr, side="right"))
+        return (higher + 1) / len(values) * 100
+
+    def _find_row(self, player_id: int) -> int | None:
+        idx = int(np.searchsorted(self._sorted_ids, player_id))
+
+        if idx < len(self._sorted_ids) and self._sorted_ids[idx] == player_id:
+            return int(self._id_order[idx])
+
+        return None
+
+    def _to_player(self, row: int) -> LeaderBoardPlayer:
+        data: LeaderBoardPlayerPayload = {
+            "name": self._names[row],
+            "mmr": to_optional_int(self._mmrs[row]),
+            "id": int(self._ids[row]),
+            "winsLastTen": int(self._wins_last_ten[row]),
+            "lossesLastTen": int(self._losses_last_ten[row]),
+            "eventsPlayed": int(self._events_played[row]),
+            "overallRank": to_optional_int(self._overall_ranks[row]),
+            "countryCode": self._country_codes[row],
+            "maxMmr": to_optional_int(self._max_mmrs[row]),
+            "winRate": to_optional_float(self._win_rates[row]),
+            "gainLossLastTen": to_optional_int(self._gain_loss_last_ten[row]),
+        }
+        return LeaderBoardPlayer(data)
+
+
+def to_float_array(values: list[int | float | None]) -> NDArray[np.float64]:
+    """Noneを含む数値のリストを, NoneをNaNとしたfloat64の配列に変換する."""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def to_optional_int(value: float) -> int | None:
+    return None if np.isnan(value) else int(value)
+
+
+def to_optional_float(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import zlib
+
+from .player import PlayerDetails
+
+__all__ = (
+    "encode_player_details",
+    "decode_player_details",
+)
+
+
+def encode_player_details(details: PlayerDetails) -> bytes:
+    """プレイヤー詳細情報を保存用のコンパクトな形式に変換する.
+    `PlayerDetails.to_dict`の結果を空白なしのJSONにし, zlibで圧縮する.
+
+    Parameters
+    ----------
+    details : PlayerDetails
+        プレイヤー詳細情報.
+
+    Returns
+    -------
+    bytes
+        変換されたデータ.
+    """
+    payload = json.dumps(details.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def decode_player_details(data: bytes) -> PlayerDetails:
+    """`encode_player_details`で変換されたデータからプレイヤー詳細情報を復元する.
+
+    Parameters
+    ----------
+    data : bytes
+        変換されたデータ.
+
+    Returns
+    -------
+    PlayerDetails
+        プレイヤー詳細情報.
+    """
+    return PlayerDetails(json.loads(zlib.decompress(data)))
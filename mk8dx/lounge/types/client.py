@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Sequence
 
 __all__ = (
     "SortBy",
@@ -9,10 +9,13 @@ __all__ = (
 )
 
 if TYPE_CHECKING:
+    from repository.types import PlayerDetailsRepository
+    from utils.cache import CacheStats
     from utils.constants import Season
 
     from ..leaderboard import LeaderBoard
     from ..player import Player, PlayerDetails
+    from ..snapshot import LeaderBoardSnapshot
     from ..utils import Search
 
 SortBy = Literal[
@@ -29,6 +32,41 @@ SortBy = Literal[
 
 
 class LoungeClient(metaclass=ABCMeta):
+    @abstractmethod
+    async def setup(self) -> None:
+        """Lounge APIへのリクエストに使うセッションを作成する.
+        セッションはコネクションプールを持ち, クライアントが閉じられるまで使い回される.
+        """
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """セッションを閉じる. 外部から渡されたセッションは閉じない."""
+        ...
+
+    @abstractmethod
+    def set_store(self, store: PlayerDetailsRepository | None) -> None:
+        """過去のシーズンのプレイヤー詳細情報を永続化するストアを設定する.
+        設定すると, 過去のシーズンのプレイヤー詳細情報はストアから取得し, APIから取得したものはストアに保存する.
+
+        Parameters
+        ----------
+        store : PlayerDetailsRepository | None
+            ストア. Noneの場合は永続化しない.
+        """
+        ...
+
+    @abstractmethod
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """キャッシュの統計情報を取得する. キャッシュの上限や有効期限の調整に使う.
+
+        Returns
+        -------
+        dict[str, CacheStats]
+            キャッシュの名前と統計情報 (ヒット数, ミス数, 破棄数など) の組.
+        """
+        ...
+
     @abstractmethod
     async def get_player(
         self,
@@ -39,7 +77,9 @@ class LoungeClient(metaclass=ABCMeta):
         fc: str | None = None,
         season: Season | None = None,
     ) -> Player | None:
-        """Lounge APIからプレイヤー情報を取得する. 一度取得した情報はキャッシュされる.
+        """Lounge APIからプレイヤー情報を取得する. 一度取得した情報は一定時間キャッシュされる.
+        過去のシーズンの情報は変更されないため, 現在のシーズンよりも長くキャッシュされる.
+        以前に取得したことのあるプレイヤーは, リーダーボードのスナップショットがあればそこから通信せずに作成する.
 
         ref: https://github.com/VikeMK/Lounge-API/blob/37c5a06039d9a40806cc57f9663b0d243e29a210/src/Lounge.Web/Controllers/PlayersController.cs#L45
 
@@ -71,8 +111,10 @@ class LoungeClient(metaclass=ABCMeta):
         player_id: int | str | None = None,
         name: str | None = None,
         season: Season | None = None,
+        stale_while_revalidate: bool = False,
     ) -> PlayerDetails | None:
-        """Lounge APIからプレイヤー詳細情報を取得する. 一度取得した情報はキャッシュされる.
+        """Lounge APIからプレイヤー詳細情報を取得する. 一度取得した情報は一定時間キャッシュされる.
+        過去のシーズンの情報は変更されないため, 現在のシーズンよりも長くキャッシュされる.
 
         ref: https://github.com/VikeMK/Lounge-API/blob/37c5a06039d9a40806cc57f9663b0d243e29a210/src/Lounge.Web/Controllers/PlayersController.cs#L85
 
@@ -84,6 +126,10 @@ class LoungeClient(metaclass=ABCMeta):
             プレイヤー名, by default None
         season : Season | None, optional
             シーズン, by default None. Noneの場合は最新のシーズン.
+        stale_while_revalidate : bool, optional
+            有効期限が切れたキャッシュも返すかどうか, by default False.
+            Trueの場合, 有効期限が切れてから一定時間以内のキャッシュがあればそれをすぐに返し, 裏でAPIから取得し直してキャッシュを更新する.
+            Discordのインタラクションなど, 多少古くても速く応答したい場合に使う.
 
         Returns
         -------
@@ -92,6 +138,34 @@ class LoungeClient(metaclass=ABCMeta):
         """
         ...
 
+    @abstractmethod
+    async def get_players_by_discord_ids(
+        self,
+        discord_ids: Sequence[int | str],
+        season: Season | None = None,
+    ) -> list[Player | None]:
+        """複数のdiscord IDからプレイヤー情報をまとめて取得する.
+        キャッシュに無いプレイヤーはリーダーボードのスナップショットから解決し,
+        解決できなかったプレイヤーのみget_playerで取得する.
+
+        Parameters
+        ----------
+        discord_ids : Sequence[int | str]
+            discord IDのリスト.
+        season : Season | None, optional
+            シーズン, by default None. Noneの場合は最新のシーズン.
+
+        Returns
+        -------
+        list[Player | None]
+            discord_idsと同じ順番のプレイヤー情報のリスト.
+
+        Notes
+        -----
+        リーダーボードにはdiscord IDが含まれないため, 以前に取得したことのあるプレイヤーのみスナップショットから解決できる.
+        """
+        ...
+
     @abstractmethod
     async def get_leaderboard(
         self,
@@ -145,3 +219,20 @@ class LoungeClient(metaclass=ABCMeta):
         これはget_playerとget_player_detailsとは異なり, 使用する機会が少ないためキャッシュは行わない.
         """
         ...
+
+    @abstractmethod
+    def get_leaderboard_snapshot(self, season: Season | None = None) -> LeaderBoardSnapshot | None:
+        """キャッシュされているリーダーボードのスナップショットを取得する. 通信は行わない.
+        現在のシーズンのスナップショットはバックグラウンドで定期的に更新される.
+
+        Parameters
+        ----------
+        season : Season | None, optional
+            シーズン, by default None. Noneの場合は最新のシーズン.
+
+        Returns
+        -------
+        LeaderBoardSnapshot | None
+            スナップショット. まだ作成されていない場合はNone.
+        """
+        ...
@@ -1,9 +1,14 @@
 from abc import ABCMeta, abstractmethod
+from datetime import datetime
 from typing import TYPE_CHECKING, Literal, TypeVar
 
+from dateutil.parser import isoparse  # type: ignore
+
 __all__ = (
     "BaseModel",
     "Search",
+    "normalize_name",
+    "parse_datetime",
 )
 
 T = TypeVar("T")
@@ -56,3 +61,44 @@ class Search:
     @property
     def query(self) -> str:
         return f"{self.category}={self.value}"
+
+
+def normalize_name(name: str) -> str:
+    """プレイヤー名を比較用に正規化する. Lounge APIの名前検索は空白と大文字小文字を区別しない.
+
+    Parameters
+    ----------
+    name : str
+        プレイヤー名.
+
+    Returns
+    -------
+    str
+        正規化されたプレイヤー名.
+    """
+    return "".join(name.split()).casefold()
+
+
+def parse_datetime(value: str) -> datetime:
+    """Lounge APIが返すISO 8601形式の日時を変換する.
+    ほとんどの場合は高速なdatetime.fromisoformatで変換し, 対応していない形式の場合のみdateutilを使う.
+
+    Parameters
+    ----------
+    value : str
+        ISO 8601形式の日時. (例: 2023-01-01T12:34:56.789Z)
+
+    Returns
+    -------
+    datetime
+        変換された日時.
+    """
+    # Python 3.10のfromisoformatは末尾のZに対応していない.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Python 3.10のfromisoformatは小数点以下が3桁か6桁以外の秒に対応していない.
+        return isoparse(value)
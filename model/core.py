@@ -6,8 +6,10 @@ __all__ = (
     "GUILDS_TABLE_NAME",
     "NSO_TOKENS_TABLE_NAME",
     "PINNED_PLAYERS_TABLE_NAME",
+    "PLAYER_DETAILS_TABLE_NAME",
     "REQUESTS_TABLE_NAME",
     "RESULTS_TABLE_NAME",
+    "SCHEMA_VERSIONS_TABLE_NAME",
     "SESSION_TOKENS_TABLE_NAME",
     "USERS_TABLE_NAME",
 )
@@ -19,7 +21,9 @@ GATHERS_TABLE_NAME = "gathers"
 GUILDS_TABLE_NAME = "guilds"
 NSO_TOKENS_TABLE_NAME = "nso_tokens"
 PINNED_PLAYERS_TABLE_NAME = "pinned_players"
+PLAYER_DETAILS_TABLE_NAME = "player_details"
 REQUESTS_TABLE_NAME = "requests"
 RESULTS_TABLE_NAME = "results"
+SCHEMA_VERSIONS_TABLE_NAME = "schema_versions"
 SESSION_TOKENS_TABLE_NAME = "session_tokens"
 USERS_TABLE_NAME = "users"
@@ -35,5 +35,6 @@ gathers = Table(
     # 挙手している時間.
     Column("hour", Integer),
     # guild_id, user_id, hourの組み合わせがユニークであることを保証する.
+    # guild_idで絞り込むクエリのインデックスも兼ねる.
     UniqueConstraint("guild_id", "user_id", "hour"),
 )
@@ -70,5 +70,6 @@ pinned_players = Table(
     # ブックマークされたプレイヤーの表示名.
     Column("bookmarked_player_display_name", Text),
     # 同じプレイヤーを同じユーザーが登録しないように.
+    # user_idで絞り込むクエリのインデックスも兼ねる.
     UniqueConstraint("user_id", "bookmarked_player_id"),
 )
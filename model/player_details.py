@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary, Table
+
+from .core import PLAYER_DETAILS_TABLE_NAME, metadata
+
+__all__ = ("player_details",)
+
+
+player_details = Table(
+    PLAYER_DETAILS_TABLE_NAME,
+    metadata,
+    # ラウンジのプレイヤーID.
+    Column("player_id", BigInteger, primary_key=True),
+    # シーズン. 過去のシーズンのみ保存する.
+    Column("season", Integer, primary_key=True),
+    # zlibで圧縮したPlayerDetailsのJSON. mmrChangesが多いプレイヤーもあるためMEDIUMBLOBにしている.
+    Column("payload", LargeBinary(length=(1 << 24) - 1), nullable=False),
+    # 保存した日時.
+    Column("updated_at", DateTime, nullable=False),
+)
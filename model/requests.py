@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Final, TypeAlias, TypedDict
 
-from sqlalchemy import BigInteger, Column, Integer, Table, Text
+from sqlalchemy import BigInteger, Column, Index, Integer, Table, Text
 
 from .core import REQUESTS_TABLE_NAME, metadata
 
@@ -25,4 +25,6 @@ requests = Table(
     Column("target_user_name", Text),
     Column("target_user_switch_fc", Text),
     Column("target_user_nsa_id", Text),
+    # フレンド申請の取得と削除はuser_idで絞り込む.
+    Index("ix_requests_user_id", "user_id"),
 )
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, TypeAlias, TypedDict
+from datetime import datetime
+from typing import Literal, TypeAlias, TypedDict
 
-from sqlalchemy import BigInteger, Column, DateTime, Integer, Table, Text
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Table, Text
 
 from .core import RESULTS_TABLE_NAME, metadata
 
 __all__ = (
+    "ImportMode",
+    "ImportSummary",
     "ResultItem",
+    "ResultCursor",
     "ResultItemWithID",
     "Results",
     "ResultPayload",
+    "ResultSummary",
 )
 
-if TYPE_CHECKING:
-    from datetime import datetime
-
 
 class ResultItem(TypedDict):
     date: datetime
@@ -35,6 +37,31 @@ class ResultPayload(TypedDict):
     data: list[ResultItem]
 
 
+# 戦績のページの続きを取得するための位置. (直前に取得した最後の戦績の対戦日時, ID)
+ResultCursor: TypeAlias = tuple[datetime, int]
+
+
+class ResultSummary(TypedDict):
+    # 戦績の数.
+    count: int
+    win: int
+    lose: int
+    draw: int
+
+
+# 戦績をインポートする方法. replaceは既存の戦績を全て置き換え, mergeは既存の戦績に無いものだけを追加する.
+ImportMode = Literal["replace", "merge"]
+
+
+class ImportSummary(TypedDict):
+    # 削除した既存の戦績の数.
+    deleted: int
+    # 追加した戦績の数.
+    inserted: int
+    # 既存の戦績と重複していたため追加しなかった戦績の数.
+    skipped: int
+
+
 results = Table(
     RESULTS_TABLE_NAME,
     metadata,
@@ -50,3 +77,7 @@ results = Table(
     # 相手チームの得点.
     Column("enemy_score", Integer),
 )
+
+# サーバーの戦績を新しい順に取得するためのインデックス. 全てのクエリがguild_idで絞り込む.
+# 戦績の一覧は対戦日時とIDの降順で並べるため, IDも同じ向きで含めてソートを不要にする.
+Index("ix_results_guild_id_played_at_id", results.c.guild_id, results.c.played_at.desc(), results.c.id.desc())
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, Table, Text
+
+from .core import SCHEMA_VERSIONS_TABLE_NAME, metadata
+
+__all__ = ("schema_versions",)
+
+
+schema_versions = Table(
+    SCHEMA_VERSIONS_TABLE_NAME,
+    metadata,
+    # 適用したマイグレーションのバージョン. 最大値が現在のスキーマのバージョン.
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    # マイグレーションの説明.
+    Column("description", Text, nullable=False),
+    # マイグレーションを適用した日時. (UTC)
+    Column("applied_at", DateTime, nullable=False),
+)
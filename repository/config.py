@@ -1,16 +1,39 @@
 from __future__ import annotations
 
+import logging
 import ssl
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Final, Literal
 
 from sqlalchemy.ext.asyncio import create_async_engine
 
-from model.core import metadata
-
+from .migration import migrate
 from .repository import Repository
 
 __all__ = ("Config",)
 
+logger = logging.getLogger(__name__)
+
+# 本番環境の設定値の初期値. AutoShardedBotは1プロセスで全てのシャードを処理するため, 接続数はそれほど必要ない.
+# 常に保持する接続の数.
+DEFAULT_POOL_SIZE: Final[int] = 10
+# 接続が足りない場合に一時的に追加する接続の数.
+DEFAULT_MAX_OVERFLOW: Final[int] = 5
+# 接続を作り直すまでの時間 (秒). MySQLのwait_timeoutより短くし, 切断された接続を使わないようにする.
+DEFAULT_POOL_RECYCLE: Final[int] = 1800
+# 空いている接続を待つ時間の上限 (秒).
+DEFAULT_POOL_TIMEOUT: Final[int] = 30
+# SELECT文の実行時間の上限 (ミリ秒). 0の場合は制限しない.
+DEFAULT_STATEMENT_TIMEOUT: Final[int] = 30_000
+
+EchoLevel = Literal["off", "info", "debug"]
+
+# SQLのログの出力方法. infoは実行したSQL, debugは結果の行も出力する.
+ECHO_LEVELS: Final[dict[EchoLevel, bool | Literal["debug"]]] = {
+    "off": False,
+    "info": True,
+    "debug": "debug",
+}
+
 
 class Config:
 
@@ -21,38 +44,108 @@ class Config:
         port: int
         db_name: str
         ssl_ca_path: str | None
+        pool_size: int
+        max_overflow: int
+        pool_recycle: int
+        pool_timeout: int
+        pool_pre_ping: bool
+        statement_timeout: int
+        echo: EchoLevel
 
     def __init__(
-        self, user: str, password: str, host_name: str, port: int, db_name: str, ssl_ca_path: str | None = None
+        self,
+        user: str,
+        password: str,
+        host_name: str,
+        port: int,
+        db_name: str,
+        ssl_ca_path: str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+        pool_recycle: int = DEFAULT_POOL_RECYCLE,
+        pool_timeout: int = DEFAULT_POOL_TIMEOUT,
+        pool_pre_ping: bool = False,
+        statement_timeout: int = DEFAULT_STATEMENT_TIMEOUT,
+        echo: EchoLevel = "off",
     ) -> None:
+        """データベースの接続設定.
+
+        Parameters
+        ----------
+        user : str
+            ユーザー名.
+        password : str
+            パスワード.
+        host_name : str
+            ホスト名.
+        port : int
+            ポート番号.
+        db_name : str
+            データベース名.
+        ssl_ca_path : str | None, optional
+            SSL接続に使うCA証明書のパス, by default None. Noneの場合はSSLを使わない.
+        pool_size : int, optional
+            常に保持する接続の数, by default DEFAULT_POOL_SIZE
+        max_overflow : int, optional
+            接続が足りない場合に一時的に追加する接続の数, by default DEFAULT_MAX_OVERFLOW
+        pool_recycle : int, optional
+            接続を作り直すまでの時間 (秒), by default DEFAULT_POOL_RECYCLE. -1の場合は作り直さない.
+        pool_timeout : int, optional
+            空いている接続を待つ時間の上限 (秒), by default DEFAULT_POOL_TIMEOUT
+        pool_pre_ping : bool, optional
+            接続を取り出すたびに疎通を確認するかどうか, by default False.
+            確認のために1往復増えるため, 通常はpool_recycleで古い接続を作り直す.
+        statement_timeout : int, optional
+            SELECT文の実行時間の上限 (ミリ秒), by default DEFAULT_STATEMENT_TIMEOUT. 0の場合は制限しない.
+        echo : EchoLevel, optional
+            SQLのログの出力方法, by default "off". SQLと引数がログに出力されるため, 本番環境ではoffにする.
+        """
+        if echo not in ECHO_LEVELS:
+            raise ValueError(f"echo must be one of {', '.join(ECHO_LEVELS)}: {echo!r}")
+
         self.user = user
         self.password = password
         self.host_name = host_name
         self.port = port
         self.db_name = db_name
         self.ssl_ca_path = ssl_ca_path
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.pool_pre_ping = pool_pre_ping
+        self.statement_timeout = statement_timeout
+        self.echo = echo
 
     @property
     def dsn(self) -> str:
         return f"mysql+aiomysql://{self.user}:{self.password}@{self.host_name}:{self.port}/{self.db_name}"
 
-    async def get_repository(self) -> Repository:
+    def get_engine_options(self) -> dict[str, Any]:
+        """create_async_engineに渡す引数を返す."""
+        connect_args: dict[str, Any] = {}
+
         if self.ssl_ca_path:
-            ssl_context = ssl.create_default_context(cafile=self.ssl_ca_path)
-            engine = create_async_engine(
-                self.dsn,
-                echo=True,
-                pool_pre_ping=True,
-                connect_args={"ssl": ssl_context},
-            )
-        else:
-            engine = create_async_engine(
-                self.dsn,
-                echo=True,
-                pool_pre_ping=True,
-            )
-
-        async with engine.begin() as conn:
-            await conn.run_sync(metadata.create_all)
+            connect_args["ssl"] = ssl.create_default_context(cafile=self.ssl_ca_path)
+
+        if self.statement_timeout > 0:
+            # 接続ごとに1回だけ設定するため, クエリごとの往復は増えない.
+            connect_args["init_command"] = f"SET SESSION max_execution_time = {int(self.statement_timeout)}"
+
+        return {
+            "echo": ECHO_LEVELS[self.echo],
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_timeout": self.pool_timeout,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": connect_args,
+        }
+
+    async def get_repository(self) -> Repository:
+        engine = create_async_engine(self.dsn, **self.get_engine_options())
+
+        version = await migrate(engine)
+        logger.info(f"Database schema version: {version}")
 
         return Repository(engine)
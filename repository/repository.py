@@ -1,42 +1,107 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Iterable, TypeVar
+from itertools import chain
+from typing import TYPE_CHECKING, Any, AsyncIterator, Final, Iterable, TypeVar
 
-from sqlalchemy import and_, delete, desc, select
+from sqlalchemy import and_, case, column, delete, desc, func, or_, select, table, text
 from sqlalchemy.dialects.mysql import insert
 
 from model.gathers import gathers
 from model.guilds import guilds
 from model.nso_tokens import nso_tokens
 from model.pinned_players import PinnedPlayer, pinned_players
+from model.player_details import player_details
 from model.requests import requests
 from model.results import results as results_table
 from model.session_tokens import session_tokens
 from model.users import users
+from utils.cache import TTLCache
+from utils.utils import chunked
 
+from .types.core import ReplaceSummary
 from .types.repository import Repository as IRepository
 
 __all__ = ("Repository",)
 
 if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement, Insert, Select, Table
     from sqlalchemy.ext.asyncio import AsyncEngine
 
     from model.gathers import GatherItem, ParticipationType
     from model.requests import RequestPayload
-    from model.results import ResultItemWithID, Results
+    from model.results import ImportMode, ImportSummary, ResultCursor, ResultItem, ResultItemWithID, Results, ResultSummary
 
 
 RepoT = TypeVar("RepoT", bound="Repository")
 
+# 1回のINSERT文で追加する行の数. 大量の行を1つの文で送らないようにする.
+BULK_INSERT_BATCH_SIZE: Final[int] = 1000
+# 戦績をmergeでインポートする際に使う一時テーブル. resultsテーブルと同じ定義で, 接続ごとに作成する.
+IMPORT_STAGING_TABLE_NAME: Final[str] = "results_import_staging"
+import_staging = table(
+    IMPORT_STAGING_TABLE_NAME,
+    column("id"),
+    column("guild_id"),
+    column("played_at"),
+    column("score"),
+    column("enemy"),
+    column("enemy_score"),
+)
+# ユーザーとラウンジのIDの紐付けをキャッシュする数と期間 (秒).
+# 紐付けを変更するのはこのBotのみで, 変更時にキャッシュも更新するため長めにしている.
+LOUNGE_ID_CACHE_SIZE: Final[int] = 10000
+LOUNGE_ID_CACHE_TTL: Final[float] = 3600
+# 1回のクエリのIN句に含めるユーザーの数.
+LOUNGE_ID_QUERY_SIZE: Final[int] = 1000
+
 
 class Repository(IRepository):
 
     if TYPE_CHECKING:
         engine: AsyncEngine
+        _lounge_ids: TTLCache[int, int | None]
 
     def __init__(self, engine: AsyncEngine) -> None:
         self.engine = engine
+        self._lounge_ids = TTLCache(maxsize=LOUNGE_ID_CACHE_SIZE, ttl=LOUNGE_ID_CACHE_TTL)
+
+    async def _bulk_replace(
+        self,
+        table: Table,
+        condition: ColumnElement[bool],
+        values: Iterable[dict[str, Any]],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+    ) -> ReplaceSummary:
+        """条件に一致する行を全て削除し, 新しい行に置き換える.
+        削除と追加は同じ接続の1つのトランザクションで行うため, 途中で失敗した場合は削除も取り消される.
+
+        Parameters
+        ----------
+        table : Table
+            置き換えるテーブル.
+        condition : ColumnElement[bool]
+            削除する行の条件.
+        values : Iterable[dict[str, Any]]
+            追加する行. batch_size個ずつ1回のINSERT文で追加する.
+        batch_size : int, optional
+            1回のINSERT文で追加する行の数, by default BULK_INSERT_BATCH_SIZE
+
+        Returns
+        -------
+        ReplaceSummary
+            削除した行と追加した行の数.
+        """
+        inserted = 0
+
+        async with self.engine.begin() as conn:
+            deleted = (await conn.execute(delete(table).where(condition))).rowcount
+
+            for batch in chunked(values, batch_size):
+                await conn.execute(table.insert(), batch)
+                inserted += len(batch)
+
+        return ReplaceSummary(deleted, inserted)
 
     # GatherRepository implementation
     async def insert_gathers(
@@ -227,30 +292,55 @@ class Repository(IRepository):
                 for (player_id, player_display_name) in records
             ]
 
-    # RequestRepository implementation
-    async def put_requests(self, user_id: int, data: RequestPayload) -> None:
-        try:
-            await self._delete_all_requests(user_id=user_id)
-        except:
-            pass
-
+    # PlayerDetailsRepository implementation
+    async def get_player_details_cache(self, player_id: int, season: int) -> bytes | None:
         async with self.engine.begin() as conn:
-            values = [
-                {
-                    "user_id": user_id,
-                    "target_user_name": d["name"],
-                    "target_user_switch_fc": d["fc"],
-                    "target_user_nsa_id": d["nsa_id"],
-                }
-                for d in data
-            ]
-            await conn.execute(requests.insert(), values)
+            query = select(player_details.c.payload).where(
+                and_(
+                    player_details.c.player_id == player_id,
+                    player_details.c.season == season,
+                ),
+            )
+            result = await conn.execute(query)
+            data = result.fetchone()
 
-    async def _delete_all_requests(self, user_id: int) -> None:
+        if data is None:
+            return None
+
+        (payload,) = data
+        return payload
+
+    async def put_player_details_cache(self, player_id: int, season: int, data: bytes) -> None:
         async with self.engine.begin() as conn:
-            query = delete(requests).where(requests.c.user_id == user_id)
+            now = datetime.now()
+            query = (
+                insert(player_details)
+                .values(
+                    player_id=player_id,
+                    season=season,
+                    payload=data,
+                    updated_at=now,
+                )
+                .on_duplicate_key_update(
+                    payload=data,
+                    updated_at=now,
+                )
+            )
             await conn.execute(query)
 
+    # RequestRepository implementation
+    async def put_requests(self, user_id: int, data: RequestPayload) -> ReplaceSummary:
+        values = (
+            {
+                "user_id": user_id,
+                "target_user_name": d["name"],
+                "target_user_switch_fc": d["fc"],
+                "target_user_nsa_id": d["nsa_id"],
+            }
+            for d in data
+        )
+        return await self._bulk_replace(requests, requests.c.user_id == user_id, values)
+
     async def get_requests(self, user_id: int) -> RequestPayload:
         async with self.engine.begin() as conn:
             query = select(
@@ -360,28 +450,46 @@ class Repository(IRepository):
 
             await conn.execute(query)
 
-    async def _delete_all_results(self, guild_id: int) -> None:
-        async with self.engine.begin() as conn:
-            query = delete(results_table).where(results_table.c.guild_id == guild_id)
-            await conn.execute(query)
+    async def put_results(self, guild_id: int, results: Results) -> ReplaceSummary:
+        values = (to_result_values(guild_id, record) for record in results)
+        return await self._bulk_replace(results_table, results_table.c.guild_id == guild_id, values)
+
+    async def import_results(
+        self,
+        guild_id: int,
+        batches: Iterable[Results],
+        mode: ImportMode = "replace",
+    ) -> ImportSummary:
+        if mode == "replace":
+            batches = iter(batches)
 
-    async def put_results(self, guild_id: int, results: Results) -> None:
-        await self._delete_all_results(guild_id=guild_id)
+            # 空のファイルで既存の戦績を全て削除しないよう, 追加する戦績が無い場合は何もしない.
+            if (first := next((batch for batch in batches if batch), None)) is None:
+                return {"deleted": 0, "inserted": 0, "skipped": 0}
+
+            values = (to_result_values(guild_id, record) for batch in chain([first], batches) for record in batch)
+            deleted, inserted = await self._bulk_replace(results_table, results_table.c.guild_id == guild_id, values)
+            return {"deleted": deleted, "inserted": inserted, "skipped": 0}
+
+        staged = 0
 
         async with self.engine.begin() as conn:
+            # 重複の判定はデータベースの照合順序で行うため, 戦績を一時テーブルに入れてからSQLで比較する.
+            # 一時テーブルは接続ごとに作られるため, 前回の失敗で残っていた場合に備えて先に削除する.
+            await conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {IMPORT_STAGING_TABLE_NAME}"))
+            await conn.execute(text(f"CREATE TEMPORARY TABLE {IMPORT_STAGING_TABLE_NAME} LIKE {results_table.name}"))
 
-            values = [
-                {
-                    "guild_id": guild_id,
-                    "played_at": record["date"],
-                    "score": record["score"],
-                    "enemy": record["enemy"],
-                    "enemy_score": record["enemyScore"],
-                }
-                for record in results
-            ]
+            for batch in batches:
+                if batch:
+                    await conn.execute(import_staging.insert(), [to_result_values(guild_id, record) for record in batch])
+                    staged += len(batch)
 
-            await conn.execute(results_table.insert(), values)
+            result = await conn.execute(select_new_results(guild_id))
+            inserted = result.rowcount
+
+            await conn.execute(text(f"DROP TEMPORARY TABLE {IMPORT_STAGING_TABLE_NAME}"))
+
+        return {"deleted": 0, "inserted": inserted, "skipped": staged - inserted}
 
     async def get_results(self, guild_id: int) -> list[ResultItemWithID]:
         async with self.engine.begin() as conn:
@@ -412,6 +520,99 @@ class Repository(IRepository):
             for (id, played_at, score, enemy_name, enemy_score) in data
         ]
 
+    async def get_latest_results(self, guild_id: int, limit: int = 1) -> list[ResultItemWithID]:
+        return await self.get_results_page(guild_id, limit)
+
+    async def get_results_page(
+        self,
+        guild_id: int,
+        limit: int,
+        before: ResultCursor | None = None,
+        offset: int = 0,
+        enemy: str | None = None,
+    ) -> list[ResultItemWithID]:
+        query = select_results_page(guild_id, limit, before, offset, enemy)
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query)
+            data = result.fetchall()
+
+        return [
+            {
+                "id": id,
+                "date": played_at,
+                "score": score,
+                "enemy": enemy_name,
+                "enemyScore": enemy_score,
+            }
+            for (id, played_at, score, enemy_name, enemy_score) in data
+        ]
+
+    async def get_result_summary(self, guild_id: int, enemy: str | None = None) -> ResultSummary:
+        diff = results_table.c.score - results_table.c.enemy_score
+        query = select(
+            func.count(),
+            func.coalesce(func.sum(case((diff > 0, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((diff < 0, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((diff == 0, 1), else_=0)), 0),
+        ).where(results_table.c.guild_id == guild_id)
+
+        if enemy is not None:
+            query = query.where(results_table.c.enemy == enemy)
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query)
+            count, win, lose, draw = result.one()
+
+        return {"count": count, "win": int(win), "lose": int(lose), "draw": int(draw)}
+
+    async def get_enemy_names(self, guild_id: int) -> list[str]:
+        query = (
+            select(results_table.c.enemy)
+            .where(results_table.c.guild_id == guild_id)
+            .group_by(results_table.c.enemy)
+            .order_by(desc(func.max(results_table.c.played_at)))
+        )
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query)
+            return list(result.scalars())
+
+    async def count_results(self, guild_id: int) -> int:
+        async with self.engine.begin() as conn:
+            query = select(func.count()).select_from(results_table).where(results_table.c.guild_id == guild_id)
+            result = await conn.execute(query)
+            return result.scalar_one()
+
+    async def iter_results(self, guild_id: int, chunk_size: int = 1000) -> AsyncIterator[list[ResultItemWithID]]:
+        async with self.engine.connect() as conn:
+            query = (
+                select(
+                    results_table.c.id,
+                    results_table.c.played_at,
+                    results_table.c.score,
+                    results_table.c.enemy,
+                    results_table.c.enemy_score,
+                )
+                .where(results_table.c.guild_id == guild_id)
+                .order_by(desc(results_table.c.played_at))
+            )
+
+            # streamはサーバーサイドカーソルを使うため, 全ての戦績を一度にメモリに読み込まない.
+            result = await conn.stream(query)
+
+            async for rows in result.partitions(chunk_size):
+                yield [
+                    {
+                        "id": id,
+                        "date": played_at,
+                        "score": score,
+                        "enemy": enemy_name,
+                        "enemyScore": enemy_score,
+                    }
+                    for (id, played_at, score, enemy_name, enemy_score) in rows
+                ]
+
     # SessionTokenRepository implementation
     async def put_session_token(self, user_id: int, session_token: str) -> None:
         async with self.engine.connect() as conn:
@@ -453,18 +654,107 @@ class Repository(IRepository):
                     )
                     await conn.execute(query)
                     await tx.commit()
+                    self._lounge_ids[user_id] = lounge_id
 
                 except:
                     await tx.rollback()
 
     async def get_lounge_id(self, user_id: int) -> int | None:
-        async with self.engine.begin() as conn:
-            query = select(users.c.lounge_id).where(users.c.id == user_id)
-            result = await conn.execute(query)
-            data = result.fetchone()
+        lounge_ids = await self.get_lounge_ids([user_id])
+        return lounge_ids[user_id]
 
-        if data is None:
-            return None
+    async def get_lounge_ids(self, user_ids: Iterable[int]) -> dict[int, int | None]:
+        lounge_ids: dict[int, int | None] = {}
+        missing: list[int] = []
+
+        for user_id in dict.fromkeys(user_ids):
+            try:
+                lounge_ids[user_id] = self._lounge_ids[user_id]
+            except KeyError:
+                missing.append(user_id)
 
-        (lounge_id,) = data
-        return lounge_id
+        if not missing:
+            return lounge_ids
+
+        async with self.engine.connect() as conn:
+            for chunk in chunked(missing, LOUNGE_ID_QUERY_SIZE):
+                query = select(users.c.id, users.c.lounge_id).where(users.c.id.in_(chunk))
+                found = {user_id: lounge_id for (user_id, lounge_id) in await conn.execute(query)}
+
+                for user_id in chunk:
+                    # 紐付けていないユーザーも毎回問い合わせないよう, Noneとしてキャッシュする.
+                    lounge_ids[user_id] = self._lounge_ids[user_id] = found.get(user_id)
+
+        return lounge_ids
+
+
+def select_results_page(
+    guild_id: int,
+    limit: int,
+    before: ResultCursor | None = None,
+    offset: int = 0,
+    enemy: str | None = None,
+) -> Select:
+    """戦績を新しい順に1ページ分取得するクエリを作成する.
+    (guild_id, played_at DESC, id DESC)のインデックスと同じ順に並べるため, ソートせずにインデックスから読み出せる.
+    列は (id, played_at, score, enemy, enemy_score) の順で, 列の型引数はSQLAlchemyのバージョンで形式が異なるため指定しない.
+    """
+    query = (
+        select(
+            results_table.c.id,
+            results_table.c.played_at,
+            results_table.c.score,
+            results_table.c.enemy,
+            results_table.c.enemy_score,
+        )
+        .where(results_table.c.guild_id == guild_id)
+        # 対戦日時が同じ戦績の順序を固定するため, IDでも並べる.
+        .order_by(desc(results_table.c.played_at), desc(results_table.c.id))
+        .limit(limit)
+    )
+
+    if enemy is not None:
+        query = query.where(results_table.c.enemy == enemy)
+
+    if before is not None:
+        played_at, id = before
+        query = query.where(
+            or_(
+                results_table.c.played_at < played_at,
+                and_(results_table.c.played_at == played_at, results_table.c.id < id),
+            )
+        )
+    elif offset > 0:
+        query = query.offset(offset)
+
+    return query
+
+
+def select_new_results(guild_id: int) -> Insert:
+    """一時テーブルの戦績のうち, 既存の戦績と重複しないものをresultsテーブルに追加するクエリを作成する.
+    対戦日時, 相手チーム名, 自チームと相手チームの得点が全て同じ戦績を重複とみなし, 一時テーブル内の重複も1つにまとめる.
+    """
+    key = ("played_at", "enemy", "score", "enemy_score")
+    duplicated = select(results_table.c.id).where(
+        results_table.c.guild_id == guild_id,
+        *(results_table.c[name] == import_staging.c[name] for name in key),
+    )
+    query = (
+        select(import_staging.c.guild_id, *(import_staging.c[name] for name in key))
+        .where(~duplicated.exists())
+        .group_by(import_staging.c.guild_id, *(import_staging.c[name] for name in key))
+        # ファイルの順に追加する.
+        .order_by(func.min(import_staging.c.id))
+    )
+    return results_table.insert().from_select(["guild_id", *key], query)
+
+
+def to_result_values(guild_id: int, record: ResultItem) -> dict[str, Any]:
+    """戦績をresultsテーブルの行に変換する."""
+    return {
+        "guild_id": guild_id,
+        "played_at": record["date"],
+        "score": record["score"],
+        "enemy": record["enemy"],
+        "enemy_score": record["enemyScore"],
+    }
@@ -1,7 +1,9 @@
+from .core import *
 from .gather import *
 from .guild import *
 from .nso_token import *
 from .pinned_player import *
+from .player_details import *
 from .request import *
 from .result import *
 from .session_token import *
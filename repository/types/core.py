@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+__all__ = ("ReplaceSummary",)
+
+
+class ReplaceSummary(NamedTuple):
+    # 削除した既存の行の数.
+    deleted: int
+    # 追加した行の数.
+    inserted: int
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+
+__all__ = ("PlayerDetailsRepository",)
+
+
+class PlayerDetailsRepository(metaclass=ABCMeta):
+    """過去のシーズンのプレイヤー詳細情報の永続化.
+    過去のシーズンの情報は変更されないため, Botを再起動した後もAPIへ問い合わせずに使い回せる.
+    """
+
+    @abstractmethod
+    async def get_player_details_cache(self, player_id: int, season: int) -> bytes | None:
+        """保存されているプレイヤー詳細情報を取得する.
+
+        Parameters
+        ----------
+        player_id : int
+            ラウンジのプレイヤーID.
+        season : int
+            シーズン.
+
+        Returns
+        -------
+        bytes | None
+            `mk8dx.lounge.store.encode_player_details`で変換されたデータ. 保存されていない場合はNone.
+        """
+        ...
+
+    @abstractmethod
+    async def put_player_details_cache(self, player_id: int, season: int, data: bytes) -> None:
+        """プレイヤー詳細情報を保存する. 既に保存されている場合は上書きする.
+
+        Parameters
+        ----------
+        player_id : int
+            ラウンジのプレイヤーID.
+        season : int
+            シーズン.
+        data : bytes
+            `mk8dx.lounge.store.encode_player_details`で変換されたデータ.
+        """
+        ...
@@ -3,6 +3,7 @@ from . import (
     GuildRepository,
     NSOTokenRepository,
     PinnedPlayerRepository,
+    PlayerDetailsRepository,
     RequestRepository,
     ResultRepository,
     SessionTokenRepository,
@@ -17,6 +18,7 @@ class Repository(
     GuildRepository,
     NSOTokenRepository,
     PinnedPlayerRepository,
+    PlayerDetailsRepository,
     RequestRepository,
     ResultRepository,
     SessionTokenRepository,
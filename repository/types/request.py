@@ -8,11 +8,13 @@ __all__ = ("RequestRepository",)
 if TYPE_CHECKING:
     from model.requests import RequestPayload
 
+    from .core import ReplaceSummary
+
 
 class RequestRepository(metaclass=ABCMeta):
     @abstractmethod
-    async def put_requests(self, user_id: int, data: RequestPayload) -> None:
-        """フレンド申請の情報を上書き保存する.
+    async def put_requests(self, user_id: int, data: RequestPayload) -> ReplaceSummary:
+        """フレンド申請の情報を上書き保存する. 既存の情報の削除と保存は1つのトランザクションで行う.
 
         Parameters
         ----------
@@ -20,6 +22,11 @@ class RequestRepository(metaclass=ABCMeta):
             フレンド申請を保存するユーザーのdiscord ID.
         data : RequestPayload
             フレンド申請のデータ.
+
+        Returns
+        -------
+        ReplaceSummary
+            削除した既存の情報と保存した情報の数.
         """
         ...
 
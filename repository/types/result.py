@@ -7,8 +7,11 @@ __all__ = ("ResultRepository",)
 
 if TYPE_CHECKING:
     from datetime import datetime
+    from typing import AsyncIterator, Iterable
 
-    from model.results import ResultItem, ResultItemWithID, Results
+    from model.results import ImportMode, ImportSummary, ResultCursor, ResultItem, ResultItemWithID, Results, ResultSummary
+
+    from .core import ReplaceSummary
 
 
 class ResultRepository(metaclass=ABCMeta):
@@ -101,8 +104,8 @@ class ResultRepository(metaclass=ABCMeta):
         ...
 
     @abstractmethod
-    async def put_results(self, guild_id: int, results: Results) -> None:
-        """指定したギルドの戦績を上書きする.
+    async def put_results(self, guild_id: int, results: Results) -> ReplaceSummary:
+        """指定したギルドの戦績を上書きする. 既存の戦績の削除と追加は1つのトランザクションで行う.
 
         Parameters
         ----------
@@ -110,12 +113,46 @@ class ResultRepository(metaclass=ABCMeta):
             ギルドのID
         results : Results
             戦績のリスト. 戦績は日付の昇順でソートされている必要がある.
+
+        Returns
+        -------
+        ReplaceSummary
+            削除した既存の戦績と追加した戦績の数.
+        """
+        ...
+
+    @abstractmethod
+    async def import_results(
+        self,
+        guild_id: int,
+        batches: Iterable[Results],
+        mode: ImportMode = "replace",
+    ) -> ImportSummary:
+        """指定したギルドに戦績をまとめて追加する.
+        全ての処理を1つのトランザクションで行うため, 途中でエラーが発生した場合は既存の戦績も含めて元に戻る.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+        batches : Iterable[Results]
+            追加する戦績. 1つのリストごとに1回のINSERT文で追加する.
+        mode : ImportMode, optional
+            "replace"の場合は既存の戦績を全て削除してから追加する, by default "replace".
+            追加する戦績が1件も無い場合は, 既存の戦績を削除しない.
+            "merge"の場合は対戦日時, 相手チーム名, 自チームと相手チームの得点が既存の戦績と同じものを追加しない.
+            相手チーム名はデータベースの照合順序で比較するため, 大文字と小文字を区別しない.
+
+        Returns
+        -------
+        ImportSummary
+            削除, 追加, 重複していた戦績の数.
         """
         ...
 
     @abstractmethod
     async def get_results(self, guild_id: int) -> list[ResultItemWithID]:
-        """指定したギルドの戦績を取得する. 対戦日時の古い順にソートされている.
+        """指定したギルドの戦績を全て取得する. 対戦日時の新しい順にソートされている.
 
         Parameters
         ----------
@@ -128,3 +165,122 @@ class ResultRepository(metaclass=ABCMeta):
             戦績のリスト
         """
         ...
+
+    @abstractmethod
+    async def get_latest_results(self, guild_id: int, limit: int = 1) -> list[ResultItemWithID]:
+        """指定したギルドの最新の戦績を取得する.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+        limit : int, optional
+            取得する戦績の数, by default 1
+
+        Returns
+        -------
+        list[ResultItemWithID]
+            戦績のリスト. 対戦日時の新しい順に並ぶ.
+        """
+        ...
+
+    @abstractmethod
+    async def get_results_page(
+        self,
+        guild_id: int,
+        limit: int,
+        before: ResultCursor | None = None,
+        offset: int = 0,
+        enemy: str | None = None,
+    ) -> list[ResultItemWithID]:
+        """指定したギルドの戦績を, 対戦日時の新しい順に1ページ分取得する.
+        beforeを指定した場合はその位置より古い戦績を取得する. (キーセットページネーション)
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+        limit : int
+            取得する戦績の数.
+        before : ResultCursor | None, optional
+            前のページの最後の戦績の (対戦日時, ID), by default None
+        offset : int, optional
+            読み飛ばす戦績の数, by default 0. 前のページを取得していない場合にのみ使う.
+        enemy : str | None, optional
+            指定した場合, 相手チーム名が一致する戦績のみを取得する, by default None
+
+        Returns
+        -------
+        list[ResultItemWithID]
+            戦績のリスト. 対戦日時の新しい順に並ぶ.
+        """
+        ...
+
+    @abstractmethod
+    async def get_result_summary(self, guild_id: int, enemy: str | None = None) -> ResultSummary:
+        """指定したギルドの戦績の数と勝敗の数を取得する.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+        enemy : str | None, optional
+            指定した場合, 相手チーム名が一致する戦績のみを集計する, by default None
+
+        Returns
+        -------
+        ResultSummary
+            戦績の数と勝敗の数.
+        """
+        ...
+
+    @abstractmethod
+    async def get_enemy_names(self, guild_id: int) -> list[str]:
+        """指定したギルドの戦績の相手チーム名を取得する.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+
+        Returns
+        -------
+        list[str]
+            相手チーム名のリスト. 重複は除かれ, 最後に対戦した日時の新しい順に並ぶ.
+        """
+        ...
+
+    @abstractmethod
+    async def count_results(self, guild_id: int) -> int:
+        """指定したギルドの戦績の数を取得する.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+
+        Returns
+        -------
+        int
+            戦績の数
+        """
+        ...
+
+    @abstractmethod
+    def iter_results(self, guild_id: int, chunk_size: int = 1000) -> AsyncIterator[list[ResultItemWithID]]:
+        """指定したギルドの戦績を, 一定数ずつに分けて取得する. 対戦日時の新しい順に並ぶ.
+        サーバーサイドカーソルで読み込むため, 戦績の数によらずメモリの使用量は一定になる.
+
+        Parameters
+        ----------
+        guild_id : int
+            ギルドのID
+        chunk_size : int, optional
+            一度に取得する戦績の数, by default 1000
+
+        Returns
+        -------
+        AsyncIterator[list[ResultItemWithID]]
+            戦績のリストを返す非同期イテレータ
+        """
+        ...
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
+from typing import TYPE_CHECKING
 
 __all__ = ("UserRepository",)
 
+if TYPE_CHECKING:
+    from typing import Iterable
+
 
 class UserRepository(metaclass=ABCMeta):
     @abstractmethod
@@ -34,3 +38,20 @@ class UserRepository(metaclass=ABCMeta):
             ラウンジに登録しているユーザーのdiscord ID
         """
         ...
+
+    @abstractmethod
+    async def get_lounge_ids(self, user_ids: Iterable[int]) -> dict[int, int | None]:
+        """複数のユーザーのラウンジのIDをまとめて取得する.
+        キャッシュに無いユーザーのみを1回のクエリで取得する.
+
+        Parameters
+        ----------
+        user_ids : Iterable[int]
+            ユーザーのdiscord IDのリスト
+
+        Returns
+        -------
+        dict[int, int | None]
+            ユーザーのdiscord IDと, 紐付けられたラウンジのIDの辞書. 紐付けていないユーザーはNone.
+        """
+        ...
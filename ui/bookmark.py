@@ -22,6 +22,7 @@ if TYPE_CHECKING:
     from discord.ui import Select
 
     from bot import Bot
+    from utils.constants import Season
 
 
 # TODO: interaction_checkで自分のブックマークのみ編集できるようにする
@@ -67,12 +68,13 @@ class BookmarkView(View):
 
         bot: Bot = interaction.client  # type: ignore
 
-        details = await bot.h.lc.get_player_details(player_id=player.id, season=CURRENT_SEASON)  # type: ignore
+        # seasonを省略すると現在のシーズンの情報を取得する.
+        details = await bot.h.lc.get_player_details(player_id=player.id, stale_while_revalidate=True)
 
         if details is None:
             raise PlayerNotFound
 
-        options = details.to_stats(display_name=player.nick_name)
+        options = await details.to_stats(bot.h.renderer, display_name=player.nick_name)
         message = interaction.message
 
         if message is None:
@@ -118,15 +120,15 @@ class BookmarkView(View):
         display_name = title.split("'s stats", maxsplit=1)[0]
         player_id = description.split("PlayerDetails/", maxsplit=1)[1].split("?")[0].replace(")", "")
 
-        season = int(select.values[0])  # type: ignore
+        season: Season = int(select.values[0])  # type: ignore
         bot: Bot = interaction.client  # type: ignore
 
-        details = await bot.h.lc.get_player_details(player_id=player_id, season=season)  # type: ignore
+        details = await bot.h.lc.get_player_details(player_id=player_id, season=season, stale_while_revalidate=True)
 
         if details is None:
             raise PlayerNotFound
 
-        options = details.to_stats(display_name=display_name)
+        options = await details.to_stats(bot.h.renderer, display_name=display_name)
         await message.edit(**options)
         await interaction.respond(f"シーズン{season}へ変更しました.", ephemeral=True)
 
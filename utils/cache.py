@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Generic, Hashable, TypedDict, TypeVar
+
+__all__ = (
+    "CacheStats",
+    "TTLCache",
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(TypedDict):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    stale_hits: int
+    evictions: int
+    expirations: int
+
+
+class TTLCache(Generic[K, V]):
+    """要素数と有効期限の両方で要素を破棄するLRUキャッシュ.
+    Noneもキャッシュする値として扱うため, キャッシュに存在しない場合は`KeyError`を送出する.
+    """
+
+    __slots__ = (
+        "maxsize",
+        "ttl",
+        "hits",
+        "misses",
+        "stale_hits",
+        "evictions",
+        "expirations",
+        "_data",
+        "_timer",
+    )
+
+    if TYPE_CHECKING:
+        maxsize: int
+        ttl: float
+        hits: int
+        misses: int
+        stale_hits: int
+        evictions: int
+        expirations: int
+        _data: OrderedDict[K, tuple[float, V]]
+        _timer: Callable[[], float]
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic) -> None:
+        """キャッシュを初期化する.
+
+        Parameters
+        ----------
+        maxsize : int
+            保持する要素の最大数. 超えた場合は最も長く参照されていない要素から破棄する.
+        ttl : float
+            要素の有効期限 (秒). `TTLCache.set`で要素ごとに上書きできる.
+        timer : Callable[[], float], optional
+            現在時刻を返す関数, by default time.monotonic
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._timer = timer
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            raise KeyError(key)
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def __contains__(self, key: object) -> bool:
+        item = self._data.get(key)  # type: ignore
+        return item is not None and item[0] > self._timer()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """要素を取得する. 存在しない場合や有効期限が切れている場合はdefaultを返す."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_stale(self, key: K, max_stale: float) -> tuple[V, bool]:
+        """有効期限が切れてから一定時間以内の要素も取得する. 古い値を返しつつ裏で更新する場合に使う.
+
+        Parameters
+        ----------
+        key : K
+            キー.
+        max_stale : float
+            有効期限が切れた要素を返す最大の経過時間 (秒).
+
+        Returns
+        -------
+        tuple[V, bool]
+            値と, 有効期限が切れているかどうかの組.
+
+        Raises
+        ------
+        KeyError
+            要素が存在しない場合, または有効期限が切れてからmax_stale以上経過している場合.
+        """
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        now = self._timer()
+
+        if expires_at + max_stale <= now:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            raise KeyError(key)
+
+        self._data.move_to_end(key)
+
+        if expires_at <= now:
+            self.stale_hits += 1
+            return value, True
+
+        self.hits += 1
+        return value, False
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """要素を追加する. 既に存在する場合は値と有効期限を更新する.
+
+        Parameters
+        ----------
+        key : K
+            キー.
+        value : V
+            値.
+        ttl : float | None, optional
+            有効期限 (秒), by default None. Noneの場合はTTLCache.ttl.
+        """
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        """要素を削除する. 存在しない場合は何もしない."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """全ての要素を削除する. 統計情報はリセットしない."""
+        self._data.clear()
+
+    def purge(self) -> int:
+        """有効期限が切れた要素を全て削除する.
+
+        Returns
+        -------
+        int
+            削除した要素の数.
+        """
+        now = self._timer()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+
+        for key in expired:
+            del self._data[key]
+
+        self.expirations += len(expired)
+        return len(expired)
+
+    @property
+    def stats(self) -> CacheStats:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
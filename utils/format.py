@@ -8,6 +8,7 @@ __all__ = (
     "user_mention",
     "format_result_datetime",
     "win_or_lose",
+    "truncate_text",
 )
 
 if TYPE_CHECKING:
@@ -103,3 +104,23 @@ def win_or_lose(diff: int) -> str:
     elif diff == 0:
         return "Draw"
     return "Win"
+
+
+def truncate_text(text: str, width: int) -> str:
+    """文字列が指定した幅より長い場合, 末尾を省略して幅に収める.
+
+    Parameters
+    ----------
+    text : str
+        文字列
+    width : int
+        最大の文字数. 1以上である必要がある.
+
+    Returns
+    -------
+    str
+        幅に収めた文字列. 省略した場合は末尾が`…`になる.
+    """
+    if len(text) <= width:
+        return text
+    return f"{text[: width - 1]}…"
@@ -0,0 +1,105 @@
+"""Botの起動時のimportにかかる時間を計測する.
+
+`python -X importtime`の結果を集計し, 時間のかかっているモジュールを表示する.
+pandasやmatplotlibのような重いライブラリが起動時に読み込まれるようになっていないかを確認するために使う.
+
+Examples
+--------
+.. code-block:: console
+
+    $ task importtime
+    $ python -m utils.importtime --top 20 --budget 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+__all__ = (
+    "ImportTime",
+    "measure_import_time",
+)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+# 起動時に読み込まれてはいけないモジュール. 初めて使うときに読み込む.
+LAZY_MODULES: tuple[str, ...] = ("pandas", "matplotlib")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    # モジュール自身の読み込みにかかった時間 (秒).
+    self_time: float
+    # モジュールが読み込んだモジュールを含めた時間 (秒).
+    cumulative: float
+    # importの入れ子の深さ. 0がトップレベル.
+    depth: int
+
+
+def measure_import_time(module: str = "bot") -> list[ImportTime]:
+    """新しいPythonプロセスでモジュールをimportし, 各モジュールの読み込みにかかった時間を返す.
+
+    Parameters
+    ----------
+    module : str, optional
+        importするモジュール, by default "bot"
+
+    Returns
+    -------
+    list[ImportTime]
+        読み込まれたモジュールごとの時間. 読み込みが完了した順に並ぶ.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: list[ImportTime] = []
+
+    for line in proc.stderr.splitlines():
+        if (m := _LINE_RE.match(line)) is None:
+            continue
+
+        self_us, cumulative_us, indent, name = m.groups()
+        times.append(ImportTime(name, int(self_us) / 1e6, int(cumulative_us) / 1e6, len(indent) // 2))
+
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Botの起動時のimportにかかる時間を計測する.")
+    parser.add_argument("module", nargs="?", default="bot", help="importするモジュール (default: bot)")
+    parser.add_argument("--top", type=int, default=15, help="表示するモジュールの数 (default: 15)")
+    parser.add_argument("--budget", type=float, default=None, help="合計時間の上限 (秒). 超えた場合は終了コード1を返す.")
+    args = parser.parse_args()
+
+    times = measure_import_time(args.module)
+    total = next((t.cumulative for t in reversed(times) if t.module == args.module), 0.0)
+
+    print(f"Total import time of {args.module}: {total:.3f}s ({len(times)} modules)")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+
+    for t in sorted(times, key=lambda t: t.self_time, reverse=True)[: args.top]:
+        print(f"{t.cumulative:>11.3f}s {t.self_time:>9.3f}s  {t.module}")
+
+    failed = False
+    eager = sorted({t.module for t in times if t.module.split(".")[0] in LAZY_MODULES})
+
+    if eager:
+        print(f"\nWARNING: modules that should be imported lazily are imported at startup: {', '.join(eager[:5])}")
+        failed = True
+
+    if args.budget is not None and total > args.budget:
+        print(f"\nWARNING: import time {total:.3f}s exceeds the budget {args.budget:.3f}s")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,7 @@ __all__ = (
     "get_friend_codes",
     "get_datetime",
     "maybe_param",
+    "parse_bool",
 )
 
 if TYPE_CHECKING:
@@ -202,3 +203,32 @@ def maybe_param(text: str) -> MaybeParam:
         return {"discord_id": discord_ids[0]}
 
     return {"name": text}
+
+
+def parse_bool(text: str) -> bool:
+    """環境変数などの真偽値を表す文字列を変換する.
+
+    Parameters
+    ----------
+    text : str
+        変換する文字列. 大文字と小文字は区別しない.
+
+    Returns
+    -------
+    bool
+        "1", "true", "yes", "on"の場合はTrue, "0", "false", "no", "off", 空文字列の場合はFalse.
+
+    Raises
+    ------
+    ValueError
+        真偽値として解釈できない場合.
+    """
+    value = text.strip().lower()
+
+    if value in ("1", "true", "yes", "on"):
+        return True
+
+    if value in ("0", "false", "no", "off", ""):
+        return False
+
+    raise ValueError(f"Invalid boolean value: {text!r}")
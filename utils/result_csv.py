@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Final, Iterable, Iterator, Literal
+
+__all__ = (
+    "InvalidResultRow",
+    "parse_results_csv",
+)
+
+if TYPE_CHECKING:
+    from model.results import Results
+
+    ResultColumn = Literal["team", "score", "enemyScore", "enemy", "date"]
+
+
+# 戦績のCSVファイルの列. 戦績のエクスポートと同じ形式で, ヘッダーは無い.
+COLUMNS: Final[tuple[ResultColumn, ...]] = ("team", "score", "enemyScore", "enemy", "date")
+
+
+class InvalidResultRow(ValueError):
+    """戦績のCSVファイルの行が正しくない場合のエラー."""
+
+    if TYPE_CHECKING:
+        line: int
+        column: ResultColumn | None
+
+    def __init__(self, line: int, column: ResultColumn | None = None) -> None:
+        """
+        Parameters
+        ----------
+        line : int
+            正しくない行の行番号. 1から始まる.
+        column : ResultColumn | None, optional
+            正しくない列, by default None. 列の数が正しくない場合はNone.
+        """
+        self.line = line
+        self.column = column
+        super().__init__(f"invalid {column or 'row'} at line {line}")
+
+
+def parse_results_csv(lines: Iterable[str], batch_size: int = 1000, offset: int = 0) -> Iterator[Results]:
+    """戦績のCSVファイルを読み込み, 戦績を一定の数ずつ返す.
+    読み込んだ行から順に検証するため, ファイル全体をメモリに読み込まない.
+
+    各行は `チーム名,自チームの得点,相手チームの得点,相手チーム名,対戦日時` の形式で, 空行は無視する.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        CSVファイルの各行. (newline=""で開いたファイルなど)
+    batch_size : int, optional
+        一度に返す戦績の数, by default 1000
+    offset : int, optional
+        戦績を保存する際のUTCとのオフセット (時間), by default 0.
+        タイムゾーンが指定されている対戦日時はこのオフセットに変換する. 指定されていない場合はそのまま保存する.
+
+    Yields
+    ------
+    Results
+        読み込んだ戦績. 最後以外はbatch_size個ずつ.
+
+    Raises
+    ------
+    InvalidResultRow
+        列の数や値が正しくない行があった場合.
+    """
+    reader = csv.reader(lines, skipinitialspace=True)
+    tz = timezone(timedelta(hours=offset))
+    batch: Results = []
+
+    for row in reader:
+        if not row:
+            continue
+
+        if len(row) != len(COLUMNS):
+            raise InvalidResultRow(reader.line_num)
+
+        _, score, enemy_score, enemy, date = row
+        batch.append(
+            {
+                "score": parse_score(score, reader.line_num, "score"),
+                "enemyScore": parse_score(enemy_score, reader.line_num, "enemyScore"),
+                "enemy": enemy,
+                "date": parse_played_at(date, reader.line_num, tz),
+            }
+        )
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def parse_score(value: str, line: int, column: ResultColumn) -> int:
+    """得点を変換する. 0以上の整数でない場合はInvalidResultRowを送出する."""
+    try:
+        score = int(value)
+    except ValueError:
+        raise InvalidResultRow(line, column) from None
+
+    if score < 0:
+        raise InvalidResultRow(line, column)
+
+    return score
+
+
+def parse_played_at(value: str, line: int, tz: timezone) -> datetime:
+    """対戦日時を変換する. タイムゾーンが指定されている場合はtzに変換し, タイムゾーンを外す."""
+    try:
+        played_at = datetime.fromisoformat(value.strip())
+    except ValueError:
+        # 表計算ソフトで編集した場合など, ISO 8601形式でない日時はdateutilで変換する.
+        from dateutil.parser import ParserError, parse  # type: ignore
+
+        try:
+            played_at = parse(value)
+        except (ParserError, OverflowError, ValueError):
+            raise InvalidResultRow(line, "date") from None
+
+    if played_at.tzinfo is not None:
+        played_at = played_at.astimezone(tz).replace(tzinfo=None)
+
+    return played_at
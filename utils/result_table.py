@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from .format import truncate_text, win_or_lose
+
+__all__ = (
+    "ResultTable",
+    "create_result_table",
+    "find_similar_enemies",
+)
+
+if TYPE_CHECKING:
+    from model.results import ResultItemWithID
+
+
+class ResultTable(NamedTuple):
+    # 1行に1つの戦績を固定幅で整形した文字列.
+    lines: list[str]
+    win: int
+    lose: int
+    draw: int
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+
+def create_result_table(
+    results: Iterable[ResultItemWithID],
+    enemy: str | None = None,
+    max_enemy_width: int | None = None,
+) -> ResultTable:
+    """戦績を表示するための表を作成する.
+    絞り込み, 勝敗の集計, 各列の幅の計算を戦績を1度走査するだけで行う.
+
+    各列は右揃えで, 列の間は空白1つで区切る. (pandas.DataFrame.to_stringと同じ形式)
+    相手チームを指定した場合は ID, 日付, 得点, 勝敗 を, 指定しない場合は ID, 得点, 相手チーム, 勝敗 を表示する.
+
+    Parameters
+    ----------
+    results : Iterable[ResultItemWithID]
+        戦績. 渡された順に表示される.
+    enemy : str | None, optional
+        指定した場合, 相手チームの名前が一致する戦績のみを表示する, by default None
+    max_enemy_width : int | None, optional
+        相手チームの名前の最大の文字数, by default None. 超える名前は末尾を省略する. Noneの場合は省略しない.
+
+    Returns
+    -------
+    ResultTable
+        整形した表と勝敗の数. 一致する戦績が無い場合は空の表.
+    """
+    rows: list[tuple[str, str, str, str]] = []
+    widths = [0, 0, 0, 0]
+    win = lose = draw = 0
+
+    for r in results:
+        if enemy is not None and r["enemy"] != enemy:
+            continue
+
+        diff = r["score"] - r["enemyScore"]
+
+        if diff > 0:
+            win += 1
+        elif diff < 0:
+            lose += 1
+        else:
+            draw += 1
+
+        score = f"{r['score']} - {r['enemyScore']}"
+
+        if enemy is not None:
+            row = (str(r["id"]), r["date"].strftime("%Y/%m/%d"), score, win_or_lose(diff))
+        else:
+            name = r["enemy"] if max_enemy_width is None else truncate_text(r["enemy"], max_enemy_width)
+            row = (str(r["id"]), score, name, win_or_lose(diff))
+
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+
+        rows.append(row)
+
+    w0, w1, w2, w3 = widths
+    lines = [f"{a:>{w0}} {b:>{w1}} {c:>{w2}} {d:>{w3}}" for a, b, c, d in rows]
+    return ResultTable(lines, win, lose, draw)
+
+
+def find_similar_enemies(names: Iterable[str], enemy: str) -> list[str]:
+    """指定した名前と頭文字が同じ相手チームの名前を返す. 大文字と小文字は区別しない.
+
+    Parameters
+    ----------
+    names : Iterable[str]
+        相手チームの名前.
+    enemy : str
+        相手チームの名前.
+
+    Returns
+    -------
+    list[str]
+        頭文字が同じ相手チームの名前. 重複は除かれ, namesに現れた順に並ぶ.
+    """
+    prefix = enemy[:1].lower()
+    return [name for name in dict.fromkeys(names) if name[:1].lower() == prefix]
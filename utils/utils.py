@@ -1,9 +1,10 @@
 from collections import OrderedDict
-from typing import Any, Callable, Iterable, NoReturn, TypeVar
+from typing import Any, Callable, Iterable, Iterator, NoReturn, TypeVar
 
 from .errors import BotError
 
 __all__ = (
+    "chunked",
     "drop_duplicates",
     "get_average",
     "deprecated",
@@ -15,6 +16,34 @@ T = TypeVar("T")
 KeyT = TypeVar("KeyT")
 
 
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """要素を先頭から一定の数ずつのリストに分ける. 要素は必要になった分だけ読み込む.
+
+    Parameters
+    ----------
+    iterable : Iterable[T]
+        分割する要素.
+    size : int
+        1つのリストの要素の数. 最後のリストはsizeより少なくなることがある.
+
+    Yields
+    ------
+    list[T]
+        分割したリスト.
+    """
+    chunk: list[T] = []
+
+    for item in iterable:
+        chunk.append(item)
+
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
 def drop_duplicates(data_with_key: Iterable[tuple[KeyT, T]]) -> list[tuple[KeyT, T]]:
     """キーが重複している場合、最初の要素のみを残して重複を削除する.
 